@@ -0,0 +1,95 @@
+def get_through(model, column):
+    """
+    Returns the through model of a many to many column together with the names of
+    the columns pointing to the row and to the related object.
+    """
+
+    field = model._meta.get_field(column)
+    return (
+        field.remote_field.through,
+        f"{field.m2m_field_name()}_id",
+        f"{field.m2m_reverse_field_name()}_id",
+    )
+
+
+def bulk_add_links(model, links):
+    """
+    Inserts through rows for `links`, a dict of `column -> [(row_id, target_id)]`,
+    with one INSERT per column.
+    """
+
+    for column, pairs in links.items():
+        if not pairs:
+            continue
+        through, row_key, target_key = get_through(model, column)
+        through.objects.bulk_create(
+            [
+                through(**{row_key: row_id, target_key: target_id})
+                for row_id, target_id in pairs
+            ],
+            ignore_conflicts=True,
+        )
+
+
+def bulk_create_rows(model, prepared):
+    """
+    Creates one row per `(values, m2m)` pair of `prepared` with a single INSERT and
+    adds all many to many values with one INSERT per column.
+    """
+
+    rows = model.objects.bulk_create([model(**values) for values, _ in prepared])
+    links = {}
+    for row, (_, m2m) in zip(rows, prepared):
+        for column, ids in m2m.items():
+            links.setdefault(column, []).extend((row.id, i) for i in ids)
+    bulk_add_links(model, links)
+    return rows
+
+
+def bulk_delete_rows(model, ids):
+    """
+    Deletes the rows with the given ids together with their many to many through
+    rows. `ids` is materialized first because filters on link columns would stop
+    matching once the through rows are gone. Links of other tables without a
+    reverse field are removed by Django's deletion collector. Returns the number
+    of deleted rows.
+    """
+
+    ids = list(ids)
+    if not ids:
+        return 0
+
+    for field in model._meta.many_to_many:
+        through, row_key, target_key = get_through(model, field.name)
+        through.objects.filter(**{f"{row_key}__in": ids}).delete()
+        if field.remote_field.model is model:
+            through.objects.filter(**{f"{target_key}__in": ids}).delete()
+
+    _, deleted = model.objects.filter(id__in=ids).delete()
+    return deleted.get(model._meta.label, 0)
+
+
+def read_links(model, column, row_ids):
+    """Returns `row_id -> [target ids]` of one many to many column in one query."""
+
+    through, row_key, target_key = get_through(model, column)
+    links = {}
+    pairs = (
+        through.objects.filter(**{f"{row_key}__in": list(row_ids)})
+        .order_by("id")
+        .values_list(row_key, target_key)
+    )
+    for row_id, target_id in pairs:
+        links.setdefault(row_id, []).append(target_id)
+    return links
+
+
+def find_linked_rows(model, column, target_ids):
+    """Returns the ids of the rows linked to any of `target_ids` through `column`."""
+
+    through, row_key, target_key = get_through(model, column)
+    return set(
+        through.objects.filter(**{f"{target_key}__in": list(target_ids)}).values_list(
+            row_key, flat=True
+        )
+    )
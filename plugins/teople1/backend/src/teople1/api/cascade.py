@@ -0,0 +1,197 @@
+import logging
+
+from django.db import transaction
+from baserow.contrib.database.table.models import Table
+
+from .bulk import (
+    bulk_add_links,
+    bulk_create_rows,
+    bulk_delete_rows,
+    find_linked_rows,
+    read_links,
+)
+from .schema import SchemaError, get_relation_field_id, get_table_schema
+from ..enrollment import forget_enrollments
+from ..models import SearchDocument
+from ..progress import forget_courses
+from ..search import forget_rows, index_rows
+
+
+logger = logging.getLogger(__name__)
+
+# The content of a course as `(child table, relation name, parent table)`, ordered
+# so that every parent comes before its children.
+COURSE_CONTENT = (
+    ("Lessons", "course", "Courses"),
+    ("Quiz", "course", "Courses"),
+    ("Questions", "quiz", "Quiz"),
+)
+
+# Per user rows that belong to a course. They are removed with the course but
+# never cloned.
+COURSE_DEPENDENTS = (
+    ("Enrollments", "course", "Courses"),
+    ("Progress", "course", "Courses"),
+)
+
+
+def resolve_edges(edges):
+    """
+    Returns `(child schema, link column, parent table)` for every edge whose table
+    and relation exist, the others are skipped.
+    """
+
+    resolved = []
+    for child_table, name, parent_table in edges:
+        try:
+            schema = get_table_schema(child_table)
+        except SchemaError:
+            continue
+        column = get_relation_field_id(child_table, parent_table, prefer=name)
+        if column is not None:
+            resolved.append((schema, column, parent_table))
+    return resolved
+
+
+def get_graph_table_ids(database_id):
+    names = {"Courses"}
+    for edges in (COURSE_CONTENT, COURSE_DEPENDENTS):
+        names.update(child for child, _, _ in edges)
+    return set(
+        Table.objects.filter(database_id=database_id, name__in=names).values_list(
+            "id", flat=True
+        )
+    )
+
+
+def copy_rows(schema, rows, graph_table_ids, overrides=None):
+    """
+    Inserts copies of `rows` with one INSERT, including their select options and
+    links to tables outside the course graph. Links inside the graph are left to
+    the caller. Returns `old id -> new id`.
+    """
+
+    plan = schema.write_plan
+    link_columns = [
+        fo["name"]
+        for fo in schema.field_objects
+        if fo["name"] in plan.by_column
+        and plan.by_column[fo["name"]][2]
+        and not (
+            fo["type"].type == "link_row"
+            and fo["field"].link_row_table_id in graph_table_ids
+        )
+    ]
+    row_ids = [row.id for row in rows]
+    links = {
+        column: read_links(schema.model, column, row_ids) for column in link_columns
+    }
+
+    prepared = []
+    for row in rows:
+        values = {
+            attname: getattr(row, attname)
+            for attname, _, is_m2m, _ in plan.by_column.values()
+            if not is_m2m
+        }
+        m2m = {column: links[column].get(row.id, []) for column in link_columns}
+        if overrides:
+            values.update(overrides[0])
+            m2m.update(overrides[1])
+        prepared.append((values, m2m))
+
+    copies = bulk_create_rows(schema.model, prepared)
+    return {row.id: copy.id for row, copy in zip(rows, copies)}
+
+
+def clone_course(course_id, overrides=None):
+    """
+    Copies a course with its lessons, quizzes and questions. Every table is copied
+    with one INSERT and its links with one INSERT per column, in one transaction.
+    `overrides` are prepared `(values, m2m)` applied to the course copy. Returns
+    the new course row and the number of copied rows per table.
+    """
+
+    course_schema = get_table_schema("Courses")
+    graph_table_ids = get_graph_table_ids(course_schema.table.database_id)
+
+    with transaction.atomic():
+        course = course_schema.model.objects.get(id=course_id)
+        id_maps = {
+            "Courses": copy_rows(course_schema, [course], graph_table_ids, overrides)
+        }
+
+        for schema, column, parent_table in resolve_edges(COURSE_CONTENT):
+            parent_map = id_maps.get(parent_table)
+            if not parent_map:
+                continue
+            child_ids = find_linked_rows(schema.model, column, parent_map)
+            rows = list(schema.model.objects.filter(id__in=child_ids))
+            id_map = copy_rows(schema, rows, graph_table_ids)
+
+            parents = read_links(schema.model, column, child_ids)
+            bulk_add_links(
+                schema.model,
+                {
+                    column: [
+                        (id_map[child_id], parent_map[parent_id])
+                        for child_id, parent_ids in parents.items()
+                        for parent_id in parent_ids
+                        if parent_id in parent_map
+                    ]
+                },
+            )
+            id_maps[schema.table.name] = id_map
+
+        index_rows(SearchDocument.COURSE, id_maps["Courses"].values())
+        index_rows(SearchDocument.LESSON, id_maps.get("Lessons", {}).values())
+
+    new_course = course_schema.model.objects.get(id=id_maps["Courses"][course.id])
+    return new_course, {table: len(id_map) for table, id_map in id_maps.items()}
+
+
+def delete_course(course_id):
+    """
+    Deletes a course with the lessons, quizzes and questions that belong to no
+    other course, and with its enrollments and progress. Every table is cleaned
+    with set based deletes in one transaction. Returns deleted rows per table.
+    """
+
+    course_schema = get_table_schema("Courses")
+
+    with transaction.atomic():
+        if not course_schema.model.objects.filter(id=course_id).exists():
+            raise course_schema.model.DoesNotExist()
+
+        deleted_ids = {"Courses": {int(course_id)}}
+        schemas = {"Courses": course_schema}
+        for schema, column, parent_table in resolve_edges(COURSE_CONTENT):
+            parent_ids = deleted_ids.get(parent_table)
+            if not parent_ids:
+                continue
+            child_ids = find_linked_rows(schema.model, column, parent_ids)
+            parents = read_links(schema.model, column, child_ids)
+            exclusive = {
+                child_id
+                for child_id in child_ids
+                if set(parents.get(child_id, ())) <= parent_ids
+            }
+            name = schema.table.name
+            deleted_ids[name] = deleted_ids.get(name, set()) | exclusive
+            schemas[name] = schema
+
+        for schema, column, parent_table in resolve_edges(COURSE_DEPENDENTS):
+            name = schema.table.name
+            linked = find_linked_rows(schema.model, column, deleted_ids[parent_table])
+            deleted_ids[name] = deleted_ids.get(name, set()) | linked
+            schemas[name] = schema
+
+        counts = {}
+        for name in reversed(list(deleted_ids)):
+            counts[name] = bulk_delete_rows(schemas[name].model, deleted_ids[name])
+        forget_courses([course_id])
+        forget_enrollments(deleted_ids.get("Enrollments", ()))
+        forget_rows(SearchDocument.COURSE, deleted_ids["Courses"])
+        forget_rows(SearchDocument.LESSON, deleted_ids.get("Lessons", ()))
+
+    return counts
@@ -0,0 +1,194 @@
+from datetime import datetime
+
+
+# Field types stored in a through table, these are written with `.set()` or bulk
+# through-row inserts after the row itself exists.
+M2M_FIELD_TYPES = {"link_row", "multiple_select"}
+
+# Field types where an empty string is a valid value rather than "no value".
+TEXT_FIELD_TYPES = {"text", "long_text", "email", "url", "phone_number"}
+
+
+class PayloadError(ValueError):
+    """Raised with every invalid key of a payload, `errors` maps key to message."""
+
+    def __init__(self, errors):
+        super().__init__("Invalid field values")
+        self.errors = errors
+
+
+def coerce_number(value, field):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"Invalid number for {field.name}")
+
+
+def coerce_boolean(value, field):
+    if isinstance(value, bool):
+        return value
+    return str(value).lower() in ("true", "1", "yes")
+
+
+def coerce_date(value, field):
+    if not isinstance(value, str):
+        return value
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        raise ValueError(f"Invalid date format for {field.name}. Use YYYY-MM-DD")
+    return parsed if getattr(field, "date_include_time", False) else parsed.date()
+
+
+def coerce_link_row(value, field):
+    if not isinstance(value, list):
+        value = [value]
+    ids = []
+    for v in value:
+        if isinstance(v, dict):
+            v = v.get("id")
+        try:
+            ids.append(int(v))
+        except (TypeError, ValueError):
+            raise ValueError(f"Invalid row id {v!r} for {field.name}")
+    return ids
+
+
+def compile_select_coercer(field):
+    """
+    Returns a function converting an option id, value or `{id|value}` dict to an
+    option id. The options are loaded once, an unknown option falls back to a
+    query so options added after compiling are still accepted.
+    """
+
+    option_ids = {}
+    for option in field.select_options.all():
+        option_ids.setdefault(option.value, option.id)
+    known_ids = set(option_ids.values())
+
+    def to_option_id(value):
+        if isinstance(value, dict):
+            value = value.get("id", value.get("value"))
+        if isinstance(value, int) and not isinstance(value, bool):
+            if value in known_ids or field.select_options.filter(id=value).exists():
+                return value
+            raise ValueError(f"Option ID {value} not found in field '{field.name}'")
+        if value in option_ids:
+            return option_ids[value]
+        option = field.select_options.filter(value=value).first()
+        if not option:
+            raise ValueError(f"Option '{value}' not found in field '{field.name}'")
+        return option.id
+
+    return to_option_id
+
+
+def compile_coercer(field_object):
+    """Returns `coerce(value)` for one field, resolving everything type specific."""
+
+    field = field_object["field"]
+    field_type = field_object["type"].type
+
+    if field_type == "number":
+        return lambda value: coerce_number(value, field)
+    if field_type == "boolean":
+        return lambda value: coerce_boolean(value, field)
+    if field_type == "date":
+        return lambda value: coerce_date(value, field)
+    if field_type == "link_row":
+        return lambda value: coerce_link_row(value, field)
+    if field_type == "single_select":
+        return compile_select_coercer(field)
+    if field_type == "multiple_select":
+        to_option_id = compile_select_coercer(field)
+        return lambda value: [
+            to_option_id(v) for v in (value if isinstance(value, list) else [value])
+        ]
+    return None
+
+
+class WritePlan:
+    """
+    Compiled once per table: every writable payload key mapped to its model
+    attribute, coercer, empty value and whether it is a many to many column. A
+    payload is then validated in one pass that reports all invalid keys at once.
+    """
+
+    def __init__(self, field_objects):
+        self.by_name = {}
+        self.by_column = {}
+        self.field_names = {}
+        for fo in field_objects:
+            if getattr(fo["type"], "read_only", False):
+                continue
+            field_type = fo["type"].type
+            is_m2m = field_type in M2M_FIELD_TYPES
+            if is_m2m:
+                empty = []
+            elif field_type == "boolean":
+                empty = False
+            else:
+                empty = "" if field_type in TEXT_FIELD_TYPES else None
+            attname = (
+                f"{fo['name']}_id" if field_type == "single_select" else fo["name"]
+            )
+            entry = (attname, compile_coercer(fo), is_m2m, empty)
+            self.by_name[fo["field"].name] = entry
+            self.by_column[fo["name"]] = entry
+            self.field_names[attname] = fo["field"].name
+
+    def prepare(self, data, aliases=None, required=()):
+        """
+        Converts a payload keyed by field name to `(values, m2m)` keyed by model
+        attribute. `aliases` maps extra payload keys to link_row columns. Unknown
+        keys and read only fields are ignored.
+        """
+
+        errors = {
+            name: "This field is required."
+            for name in required
+            if data.get(name) in (None, "", [])
+        }
+        values = {}
+        m2m = {}
+        for key, value in data.items():
+            entry = self.by_name.get(key)
+            if entry is None and aliases and key in aliases:
+                entry = self.by_column.get(aliases[key])
+            if entry is None or key in errors:
+                continue
+
+            attname, coerce, is_m2m, empty = entry
+            if value is None or value == "":
+                value = empty
+            elif coerce is not None:
+                try:
+                    value = coerce(value)
+                except ValueError as e:
+                    errors[key] = str(e)
+                    continue
+            if is_m2m:
+                m2m[attname] = value
+            else:
+                values[attname] = value
+
+        if errors:
+            raise PayloadError(errors)
+        return values, m2m
+
+    def prepare_many(self, items, aliases=None, required=()):
+        """Prepares every payload of `items`, errors are keyed by item index."""
+
+        prepared = []
+        errors = {}
+        for index, data in enumerate(items):
+            if not isinstance(data, dict):
+                errors[str(index)] = "Every item must be an object."
+                continue
+            try:
+                prepared.append(self.prepare(data, aliases, required))
+            except PayloadError as e:
+                errors[str(index)] = e.errors
+        if errors:
+            raise PayloadError(errors)
+        return prepared
@@ -0,0 +1,59 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections
+
+
+# Threads running the queries of the async views. Every thread keeps its own
+# database connection, so the pool size also bounds their connections.
+DEFAULT_READ_THREADS = 8
+
+_executor = None
+_executor_lock = Lock()
+
+
+def get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=getattr(
+                    settings, "TEOPLE1_READ_THREADS", DEFAULT_READ_THREADS
+                ),
+                thread_name_prefix="teople1-read",
+            )
+    return _executor
+
+
+def _call(func, args):
+    # Pool threads don't see request_started/finished, drop connections that
+    # expired or broke since the thread last used them.
+    close_old_connections()
+    return func(*args)
+
+
+async def run_read(func, *args):
+    """Runs the blocking `func(*args)` on the read pool."""
+
+    return await sync_to_async(_call, thread_sensitive=False, executor=get_executor())(
+        func, args
+    )
+
+
+async def gather_reads(reads):
+    """
+    Runs `{key: (func, *args)}` concurrently on the read pool and returns
+    `{key: result}`. The first exception is raised once all reads finished.
+    """
+
+    keys = list(reads)
+    results = await asyncio.gather(
+        *(run_read(*reads[key]) for key in keys), return_exceptions=True
+    )
+    for result in results:
+        if isinstance(result, Exception):
+            raise result
+    return dict(zip(keys, results))
@@ -0,0 +1,80 @@
+from .bulk import read_links
+from .cache import LRUCache
+from .schema import SchemaError, get_table_schema
+
+
+DISPLAY_CACHE_SIZE = 50000
+
+# `(table id, row id) -> primary field value as text` of linked rows.
+display_values = LRUCache(DISPLAY_CACHE_SIZE)
+# Ids of the tables `display_values` has held values of.
+display_tables = set()
+
+
+def get_display_values(table_name, ids):
+    """
+    Returns `row id -> primary field value as text` of rows in `table_name`, like
+    `str(row)` would per row. Cached values are reused, the others are loaded
+    with one query.
+    """
+
+    ids = set(ids)
+    if not ids:
+        return {}
+    try:
+        schema = get_table_schema(table_name)
+    except SchemaError:
+        return {}
+    if schema.primary_column is None:
+        return {}
+
+    table_id = schema.table.id
+    cached = display_values.get_many([(table_id, row_id) for row_id in ids])
+    values = {row_id: value for (_, row_id), value in cached.items()}
+    missing = ids - set(values)
+    if missing:
+        loaded = {
+            row_id: f"unnamed row {row_id}" if value is None else str(value)
+            for row_id, value in schema.model.objects.filter(
+                id__in=missing
+            ).values_list("id", schema.primary_column)
+        }
+        display_values.set_many(
+            {(table_id, row_id): value for row_id, value in loaded.items()}
+        )
+        display_tables.add(table_id)
+        values.update(loaded)
+    return values
+
+
+def forget_display_values(table_id, row_ids):
+    """Drops cached values of rows that were updated or deleted."""
+
+    display_values.delete_many([(table_id, row_id) for row_id in row_ids])
+
+
+def load_links(schema, rows, expand=()):
+    """
+    Returns `link column -> row id -> value` for all link columns of `rows`, with
+    one query per column. Values are id lists, for the columns in `expand` they
+    are `[{"id", "value"}]` with one more query per column for the display values.
+    """
+
+    row_ids = [row.id for row in rows]
+    links = {}
+    for column in schema.link_columns:
+        links[column] = read_links(schema.model, column, row_ids) if row_ids else {}
+    return expand_links(schema, links, expand)
+
+
+def expand_links(schema, links, expand):
+    """Replaces the id lists of the columns in `expand` by `[{"id", "value"}]`."""
+
+    for column in expand:
+        target_ids = {i for ids in links[column].values() for i in ids}
+        names = get_display_values(schema.link_targets.get(column), target_ids)
+        links[column] = {
+            row_id: [{"id": i, "value": names.get(i, "")} for i in ids]
+            for row_id, ids in links[column].items()
+        }
+    return links
@@ -0,0 +1,23 @@
+import zlib
+
+from django.db import connection
+
+
+def key_hash(*parts):
+    """Maps `parts` to a signed 32 bit integer usable as advisory lock key."""
+
+    value = zlib.crc32(":".join(str(part) for part in parts).encode())
+    return value - 2**32 if value >= 2**31 else value
+
+
+def advisory_xact_lock(namespace, *parts):
+    """
+    Takes a PostgreSQL advisory lock on `(namespace, parts)` that is held until
+    the current transaction ends. Used to serialize writes on a logical key that
+    has no unique index, like a row identified by its links.
+    """
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT pg_advisory_xact_lock(%s, %s)", [namespace, key_hash(*parts)]
+        )
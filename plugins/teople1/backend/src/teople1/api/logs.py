@@ -0,0 +1,81 @@
+import logging
+import time
+from threading import Lock
+
+
+# Seconds between two log records of the same repeated failure.
+SAMPLE_INTERVAL = 60
+
+
+class LogSampler:
+    """
+    Lets the record of a key through at most once per `interval` seconds and
+    counts the ones held back, so a failure repeating on every request can't
+    flood the logs.
+    """
+
+    def __init__(self, interval=SAMPLE_INTERVAL):
+        self.interval = interval
+        self._logged_at = {}
+        self._suppressed = {}
+        self._lock = Lock()
+
+    def sample(self, key):
+        """
+        Returns None when the record of `key` should be dropped, otherwise how
+        many were dropped since the last one that was let through.
+        """
+
+        now = time.monotonic()
+        with self._lock:
+            logged_at = self._logged_at.get(key)
+            if logged_at is not None and now - logged_at < self.interval:
+                self._suppressed[key] = self._suppressed.get(key, 0) + 1
+                return None
+            self._logged_at[key] = now
+            return self._suppressed.pop(key, 0)
+
+    def clear(self):
+        with self._lock:
+            self._logged_at.clear()
+            self._suppressed.clear()
+
+
+sampler = LogSampler()
+
+
+class FieldErrors:
+    """
+    The fields whose values couldn't be read while serializing one response.
+    Failures are only counted per field, `log` writes one sampled warning per
+    field instead of one per cell.
+    """
+
+    def __init__(self):
+        self.fields = {}
+
+    def __bool__(self):
+        return bool(self.fields)
+
+    def add(self, name, error):
+        if name in self.fields:
+            self.fields[name][0] += 1
+        else:
+            self.fields[name] = [1, error]
+
+    def log(self, logger, table_name):
+        if not self.fields or not logger.isEnabledFor(logging.WARNING):
+            return
+        for name, (count, error) in self.fields.items():
+            suppressed = sampler.sample((table_name, name, type(error)))
+            if suppressed is None:
+                continue
+            logger.warning(
+                "Couldn't get field %s of %s in %d rows: %s "
+                "(%d similar warnings suppressed)",
+                name,
+                table_name,
+                count,
+                error,
+                suppressed,
+            )
@@ -0,0 +1,41 @@
+from baserow.contrib.database.fields.models import Field
+from django.conf import settings
+from django.db.models import Count, Max
+
+from .cache import LRUCache
+
+
+# Generated models kept at once, over all tables and tenants.
+MODEL_CACHE_SIZE = getattr(settings, "TEOPLE1_MODEL_CACHE_SIZE", 1000)
+
+# `(table id, schema version) -> generated model`. A field change gives the
+# table a new version, the models of old versions age out of the cache.
+table_models = LRUCache(MODEL_CACHE_SIZE)
+
+
+def get_schema_version(table):
+    """
+    Fingerprint of the fields of `table`: their number and last change. Creating,
+    changing, trashing or restoring a field changes it.
+    """
+
+    version = Field.objects.filter(table_id=table.id).aggregate(
+        count=Count("id"), updated_on=Max("updated_on")
+    )
+    return version["count"], version["updated_on"]
+
+
+def get_table_model(table):
+    """Returns the generated model of `table`, built only for a new version."""
+
+    key = (table.id, get_schema_version(table))
+    model = table_models.get(key)
+    if model is None:
+        model = table.get_model()
+        table_models.set(key, model)
+    return model
+
+
+def forget_table_models(table_ids):
+    table_ids = set(table_ids)
+    table_models.delete_where(lambda key: key[0] in table_ids)
@@ -0,0 +1,89 @@
+import json
+from datetime import date, datetime, time
+from decimal import Decimal
+
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+
+class TeopleJSONEncoder(JSONEncoder):
+    """
+    Stdlib fallback producing the same output as orjson: dates in full ISO 8601
+    and decimals as numbers. Everything else is left to DRF's encoder.
+    """
+
+    def default(self, obj):
+        if isinstance(obj, Decimal):
+            return float(obj)
+        if isinstance(obj, (datetime, date, time)):
+            return obj.isoformat()
+        return super().default(obj)
+
+
+fallback_encoder = TeopleJSONEncoder()
+
+
+def encode_default(obj):
+    if isinstance(obj, Decimal):
+        return float(obj)
+    return fallback_encoder.default(obj)
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    Renders with orjson when it is installed, which encodes datetimes natively,
+    so serializers can return row values as they come from the database.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        if orjson is None:
+            return json.dumps(
+                data,
+                cls=TeopleJSONEncoder,
+                ensure_ascii=False,
+                separators=(",", ":"),
+            ).encode()
+        return orjson.dumps(
+            data, default=encode_default, option=orjson.OPT_NON_STR_KEYS
+        )
+
+
+def encode_msgpack_default(obj):
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if isinstance(obj, (datetime, date, time)):
+        return obj.isoformat()
+    return fallback_encoder.default(obj)
+
+
+class MessagePackRenderer(BaseRenderer):
+    """
+    Renders `application/msgpack` for clients asking for it with the Accept
+    header or `?format=msgpack`. Dates are encoded as ISO strings like in JSON.
+    """
+
+    media_type = "application/msgpack"
+    format = "msgpack"
+    charset = None
+    render_style = "binary"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        return msgpack.packb(data, default=encode_msgpack_default)
+
+
+# JSON stays the default, MessagePack is offered when msgpack is installed.
+RENDERER_CLASSES = (FastJSONRenderer,) + ((MessagePackRenderer,) if msgpack else ())
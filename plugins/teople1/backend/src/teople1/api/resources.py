@@ -0,0 +1,524 @@
+import logging
+from decimal import Decimal
+
+from django.core.exceptions import ObjectDoesNotExist
+from django.db import IntegrityError, models, transaction
+from rest_framework import status
+from rest_framework.exceptions import APIException, MethodNotAllowed
+from rest_framework.permissions import AllowAny
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from ..invalidation import publish_rows
+from ..realtime import get_row_owners, publish_changes
+from .bulk import bulk_create_rows, bulk_delete_rows
+from .coercion import PayloadError
+from .links import expand_links, load_links
+from .renderers import RENDERER_CLASSES
+from .schema import SchemaError, ensure_required_relationships, get_table_schema
+
+
+logger = logging.getLogger(__name__)
+
+
+def as_column_value(field, value):
+    """
+    Returns `value` the way the database returns it for `field`, so coerced
+    numbers compare equal to the stored decimals.
+    """
+
+    if isinstance(field, models.DecimalField) and isinstance(value, float):
+        return Decimal(str(value))
+    return value
+
+
+class ResourceError(Exception):
+    """An error that is returned to the client as `{"status": "error", ...}`."""
+
+    def __init__(self, message, status_code=status.HTTP_400_BAD_REQUEST, **extra):
+        super().__init__(message)
+        self.message = message
+        self.status_code = status_code
+        self.extra = extra
+
+
+class TableResource(APIView):
+    """
+    Generic list/detail endpoint for one table of the Teople database. Subclasses
+    only configure the table and the response keys, the schema, serializers,
+    link loading, pagination and bulk writes are shared.
+    """
+
+    permission_classes = (AllowAny,)
+    renderer_classes = RENDERER_CLASSES
+
+    table_name = None
+    item_key = "row"
+    list_key = "rows"
+    label = "Row"
+
+    # Payload keys that must be present when creating a row.
+    required_fields = ()
+    # Link names mapped to the table they point to. These are accepted as payload
+    # keys even when the field itself is named differently.
+    relationships = {}
+    # Whether missing `relationships` fields are created in the table.
+    ensure_relationships = False
+    # Query parameters filtering the list, mapped to a name in `relationships`.
+    filter_params = {}
+    # Whether written rows are pushed to the websocket groups of the users and
+    # courses they link to.
+    realtime = False
+
+    default_page_size = 100
+    max_page_size = 1000
+    max_batch_size = 1000
+
+    # Extra routes are mounted with `as_view(action=...)`. The method of that name
+    # is called for the HTTP methods listed here.
+    action = None
+    action_methods = {"batch_create": ("post",), "batch_delete": ("post",)}
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        allowed = self.action_methods.get(self.action, ())
+        if self.action and request.method.lower() not in allowed:
+            raise MethodNotAllowed(request.method)
+
+    def handle_exception(self, exc):
+        if isinstance(exc, PayloadError):
+            return self.error(str(exc), status.HTTP_400_BAD_REQUEST, errors=exc.errors)
+        if isinstance(exc, ResourceError):
+            return self.error(exc.message, exc.status_code, **exc.extra)
+        if isinstance(exc, ObjectDoesNotExist):
+            return self.error(f"{self.label} not found", status.HTTP_404_NOT_FOUND)
+        if isinstance(exc, SchemaError):
+            return self.error(str(exc), status.HTTP_500_INTERNAL_SERVER_ERROR)
+        if isinstance(exc, (ValueError, IntegrityError)):
+            return self.error(str(exc), status.HTTP_400_BAD_REQUEST)
+        if isinstance(exc, APIException):
+            return super().handle_exception(exc)
+        logger.exception("Error in %s: %s", type(self).__name__, exc)
+        return self.error(str(exc), status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+    def error(self, message, status_code, **extra):
+        return Response(
+            {"status": "error", "message": message, **extra}, status=status_code
+        )
+
+    def get_schema(self):
+        return get_table_schema(self.table_name)
+
+    def get_relation_columns(self, schema):
+        """Returns `relationship name -> link_row column` for `relationships`."""
+
+        if not self.relationships:
+            return {}
+        if self.ensure_relationships:
+            return ensure_required_relationships(self.table_name, self.relationships)
+        columns = {}
+        for name, target_table in self.relationships.items():
+            column = schema.relation_column(target_table, prefer=name)
+            if column:
+                columns[name] = column
+        return columns
+
+    def get_queryset(self, schema):
+        return schema.enhance(schema.model.objects.all())
+
+    def get_expand(self, request, schema):
+        """
+        Returns the link columns named in `?expand=`, by field name or by a name
+        in `relationships`.
+        """
+
+        names = request.query_params.get("expand")
+        if not names:
+            return []
+
+        relations = self.get_relation_columns(schema) if self.relationships else {}
+        columns = []
+        for name in names.split(","):
+            name = name.strip()
+            field_object = schema.by_name.get(name)
+            column = relations.get(name) or (field_object and field_object["name"])
+            if column not in schema.link_columns:
+                raise ResourceError(f"Can't expand '{name}', it isn't a link field")
+            columns.append(column)
+        return columns
+
+    def serialize_rows(self, request, schema, rows, shape="rows"):
+        """
+        Serializes `rows` with the link ids of all rows loaded at once, links in
+        `?expand=` are embedded as `{"id", "value"}` objects.
+        """
+
+        links = load_links(schema, rows, self.get_expand(request, schema))
+        if shape == "columns":
+            return schema.serialize_columns(rows, links)
+        return schema.serialize_many(rows, links)
+
+    def serialize_row(self, request, schema, row):
+        return self.serialize_rows(request, schema, [row])[0]
+
+    def read_rows(self, params=None, row_id=None):
+        """
+        Serialized rows matching the `filter_params` in `params`, or the row
+        `row_id`, outside of a request. Used by the composite async views.
+        """
+
+        schema = self.get_schema()
+        queryset = self.get_queryset(schema)
+        if row_id is not None:
+            rows = [queryset.get(id=row_id)]
+        else:
+            filters = self.get_relation_filters(schema, params or {})
+            rows = list(queryset.filter(**filters) if filters else queryset)
+        return schema.serialize_many(rows, load_links(schema, rows))
+
+    def filter_queryset(self, request, schema, queryset):
+        filters = self.get_relation_filters(schema, request.query_params)
+        return queryset.filter(**filters) if filters else queryset
+
+    def get_relation_filters(self, schema, params):
+        """Converts the `filter_params` present in `params` to ORM lookups."""
+
+        if not self.filter_params:
+            return {}
+
+        columns = self.get_relation_columns(schema)
+        filters = {}
+        for param, name in self.filter_params.items():
+            value = params.get(param)
+            if value in (None, "") or name not in columns:
+                continue
+            try:
+                filters[columns[name]] = int(value)
+            except (TypeError, ValueError):
+                raise ResourceError(f"{param} must be an integer")
+        return filters
+
+    def get_field_filters(self, schema, params):
+        """
+        Converts `{filter param or field name: value}` to ORM lookups. Link and
+        multiple select fields match rows linked to the given id, other fields
+        match on equality.
+        """
+
+        filters = self.get_relation_filters(schema, params)
+        for key, value in params.items():
+            if key in self.filter_params:
+                continue
+            field_object = schema.by_name.get(key)
+            if field_object is None:
+                raise ResourceError(f"Unknown filter '{key}'")
+            field_type = field_object["type"].type
+            if field_type == "single_select":
+                filters[f"{field_object['name']}_id"] = value
+            else:
+                filters[field_object["name"]] = value
+        return filters
+
+    def paginate(self, request, queryset):
+        """
+        Returns `(rows, page)`. Without a `page` query parameter all rows are
+        returned and `page` is None.
+        """
+
+        page = request.query_params.get("page")
+        if page is None:
+            return list(queryset), None
+
+        try:
+            page = int(page)
+            size = int(request.query_params.get("size", self.default_page_size))
+        except ValueError:
+            raise ResourceError("page and size must be integers")
+        if page < 1 or size < 1:
+            raise ResourceError("page and size must be positive")
+
+        size = min(size, self.max_page_size)
+        offset = (page - 1) * size
+        count = queryset.count()
+        rows = list(queryset[offset : offset + size])
+        return rows, {
+            "count": count,
+            "page": page,
+            "size": size,
+            "next": page + 1 if offset + size < count else None,
+        }
+
+    def get_payload(self, request):
+        if not isinstance(request.data, dict):
+            raise ResourceError("Invalid input data format")
+        return request.data
+
+    def validate_create(self, schema, values, m2m, relations):
+        """Hook to reject a new row, called with its prepared values."""
+
+    def before_write(self, schema, ids):
+        """
+        Hook called in the write transaction before existing rows are updated or
+        deleted. The return value is passed on to `after_write`.
+        """
+
+    def after_write(self, schema, ids, previous, changed=None):
+        """
+        Hook called in the write transaction after rows were created, updated or
+        deleted, with the value `before_write` returned (None for new rows).
+        `changed` are the columns an update changed, None for other writes.
+        """
+
+    def begin_write(self, schema, ids):
+        """Calls `before_write` and collects who the rows are published to."""
+
+        owners = get_row_owners(self.table_name, ids) if self.realtime else None
+        return owners, self.before_write(schema, ids)
+
+    def end_write(self, schema, ids, state=(None, None), changed=None):
+        """Calls `after_write` with what `begin_write` returned and publishes."""
+
+        owners, previous = state
+        self.after_write(schema, ids, previous, changed)
+        if self.realtime:
+            publish_changes(self.table_name, ids, owners)
+
+    def get(self, request, row_id=None):
+        schema = self.get_schema()
+        queryset = self.get_queryset(schema)
+
+        if row_id is not None:
+            row = queryset.get(id=row_id)
+            return Response(
+                {
+                    "status": "success",
+                    self.item_key: self.serialize_row(request, schema, row),
+                }
+            )
+
+        shape = request.query_params.get("shape", "rows")
+        if shape not in ("rows", "columns"):
+            raise ResourceError("shape must be rows or columns")
+
+        queryset = self.filter_queryset(request, schema, queryset)
+        rows, page = self.paginate(request, queryset)
+        body = {"status": "success", "count": page["count"] if page else len(rows)}
+        if page:
+            body.update(page)
+        if shape == "columns":
+            body["columns"] = schema.serializer.columns
+            body["rows"] = self.serialize_rows(request, schema, rows, shape)
+        else:
+            body[self.list_key] = self.serialize_rows(request, schema, rows)
+        return Response(body)
+
+    def post(self, request, **kwargs):
+        if self.action:
+            return getattr(self, self.action)(request, **kwargs)
+
+        schema = self.get_schema()
+        data = self.get_payload(request)
+        relations = self.get_relation_columns(schema)
+        values, m2m = schema.write_plan.prepare(
+            data, aliases=relations, required=self.required_fields
+        )
+        self.validate_create(schema, values, m2m, relations)
+
+        with transaction.atomic():
+            row = schema.model.objects.create(**values)
+            for column, ids in m2m.items():
+                getattr(row, column).set(ids)
+            self.end_write(schema, [row.id])
+
+        return Response(
+            {
+                "status": "success",
+                "message": f"{self.label} created successfully",
+                self.item_key: self.serialize_row(request, schema, row),
+            },
+            status=status.HTTP_201_CREATED,
+        )
+
+    def put(self, request, row_id=None, **kwargs):
+        if self.action:
+            return getattr(self, self.action)(request, row_id=row_id, **kwargs)
+        return self.update(request, row_id)
+
+    def patch(self, request, row_id=None):
+        return self.update(request, row_id)
+
+    def update(self, request, row_id):
+        """
+        Applies a partial payload and only writes what changed: differing columns
+        are saved with `update_fields` and link columns are only replaced when the
+        ids differ. Nothing is written when nothing changed.
+        """
+
+        schema = self.get_schema()
+        data = self.get_payload(request)
+        relations = self.get_relation_columns(schema)
+        plan = schema.write_plan
+        values, m2m = plan.prepare(data, aliases=relations)
+
+        with transaction.atomic():
+            row = (
+                self.get_queryset(schema).select_for_update(of=("self",)).get(id=row_id)
+            )
+            links = load_links(schema, [row])
+            previous = self.begin_write(schema, [row.id])
+            changed = self.apply_changes(row, values, m2m, links)
+            if changed:
+                self.end_write(schema, [row.id], previous, changed)
+                self.forget_display_values(schema.table.id, [row.id])
+
+        links = expand_links(schema, links, self.get_expand(request, schema))
+        return Response(
+            {
+                "status": "success",
+                "message": f"{self.label} updated successfully",
+                "updated_fields": [plan.field_names[attname] for attname in changed],
+                self.item_key: schema.serialize(row, links),
+            }
+        )
+
+    def apply_changes(self, row, values, m2m, links=None):
+        """
+        Writes the prepared `values` and `m2m` that differ from the locked `row`
+        and returns the changed attributes. `links` are the row's link ids from
+        `load_links`, they are compared instead of querying the links again and
+        updated with the written ids.
+        """
+
+        fields = {field.attname: field for field in row._meta.concrete_fields}
+        dirty = []
+        for attname, value in values.items():
+            value = as_column_value(fields.get(attname), value)
+            if getattr(row, attname) != value:
+                setattr(row, attname, value)
+                dirty.append(attname)
+
+        changed_links = []
+        for column, ids in m2m.items():
+            manager = getattr(row, column)
+            if links is not None and column in links:
+                current = links[column].get(row.id, [])
+            else:
+                current = [obj.id for obj in manager.all()]
+            if set(current) != set(ids):
+                manager.set(ids)
+                changed_links.append(column)
+                if links is not None and column in links:
+                    # Like `set()`: kept links first, then the added ones.
+                    links[column][row.id] = [i for i in current if i in ids] + [
+                        i for i in ids if i not in current
+                    ]
+
+        if dirty or changed_links:
+            row.save(update_fields=dirty + ["updated_on"])
+        return dirty + changed_links
+
+    def forget_display_values(self, table_id, ids):
+        """
+        Drops cached link display values of the rows, in other workers once the
+        write commits.
+        """
+
+        publish_rows(table_id, ids)
+
+    def delete(self, request, row_id=None, **kwargs):
+        if self.action:
+            return getattr(self, self.action)(request, row_id=row_id, **kwargs)
+
+        if row_id is None:
+            raise ResourceError(f"{self.label} not found", status.HTTP_404_NOT_FOUND)
+        # The URL captures a string, the owners and cached values are keyed by the
+        # int id.
+        ids = [int(row_id)]
+        schema = self.get_schema()
+        with transaction.atomic():
+            previous = self.begin_write(schema, ids)
+            deleted = bulk_delete_rows(schema.model, ids)
+            if deleted:
+                self.end_write(schema, ids, previous)
+                self.forget_display_values(schema.table.id, ids)
+        if not deleted:
+            raise ResourceError(f"{self.label} not found", status.HTTP_404_NOT_FOUND)
+        return Response(
+            {"status": "success", "message": f"{self.label} deleted successfully"}
+        )
+
+    def batch_create(self, request):
+        """Creates all rows in `{"items": [...]}` with one INSERT per table."""
+
+        data = request.data
+        items = data.get("items") if isinstance(data, dict) else data
+        if not isinstance(items, list) or not items:
+            raise ResourceError("items must be a non-empty list")
+        if len(items) > self.max_batch_size:
+            raise ResourceError(f"At most {self.max_batch_size} items per batch")
+
+        schema = self.get_schema()
+        relations = self.get_relation_columns(schema)
+        prepared = schema.write_plan.prepare_many(
+            items, aliases=relations, required=self.required_fields
+        )
+        for values, m2m in prepared:
+            self.validate_create(schema, values, m2m, relations)
+
+        with transaction.atomic():
+            rows = bulk_create_rows(schema.model, prepared)
+            self.end_write(schema, [row.id for row in rows])
+
+        created = self.get_queryset(schema).filter(id__in=[row.id for row in rows])
+        data = self.serialize_rows(request, schema, list(created))
+        return Response(
+            {
+                "status": "success",
+                "message": f"{len(data)} {self.list_key} created successfully",
+                "count": len(data),
+                self.list_key: data,
+            },
+            status=status.HTTP_201_CREATED,
+        )
+
+    def batch_delete(self, request):
+        """
+        Deletes the rows matching `{"ids": [...]}` and/or `{"filters": {...}}` with
+        one DELETE per through table and one for the table, in one transaction.
+        """
+
+        data = self.get_payload(request)
+        ids = data.get("ids")
+        filters = data.get("filters")
+        if not ids and not filters:
+            raise ResourceError("Provide ids or filters to select the rows to delete")
+        if ids is not None and not isinstance(ids, list):
+            raise ResourceError("ids must be a list")
+        if filters is not None and not isinstance(filters, dict):
+            raise ResourceError("filters must be an object")
+
+        schema = self.get_schema()
+        queryset = schema.model.objects.all()
+        if ids:
+            try:
+                queryset = queryset.filter(id__in=[int(i) for i in ids])
+            except (TypeError, ValueError):
+                raise ResourceError("ids must be integers")
+        if filters:
+            queryset = queryset.filter(**self.get_field_filters(schema, filters))
+
+        with transaction.atomic():
+            ids = list(queryset.values_list("id", flat=True))
+            previous = self.begin_write(schema, ids)
+            deleted = bulk_delete_rows(schema.model, ids)
+            if deleted:
+                self.end_write(schema, ids, previous)
+                self.forget_display_values(schema.table.id, ids)
+
+        return Response(
+            {
+                "status": "success",
+                "message": f"{deleted} {self.list_key} deleted successfully",
+                "deleted": deleted,
+            }
+        )
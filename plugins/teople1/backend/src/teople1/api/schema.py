@@ -0,0 +1,280 @@
+import logging
+import time
+
+from django.conf import settings
+from django.db import transaction
+from baserow.contrib.database.table.models import Table
+from baserow.contrib.database.fields.models import Field
+
+from ..memo import forget, memoized
+from ..routers import pin_primary
+from ..tenants import TenantNotFound, forget_databases, get_current_database_id
+from .cache import LRUCache
+from .coercion import WritePlan
+from .logs import sampler
+from .model_cache import get_table_model, table_models
+from .serializers import RowSerializer
+
+
+logger = logging.getLogger(__name__)
+
+
+# Generated models and their field plans are reused for this many seconds before
+# the table is looked up and generated again.
+SCHEMA_TTL = 60
+
+# Schemas of all tenants kept at once, about ten per tenant.
+SCHEMA_CACHE_SIZE = getattr(settings, "TEOPLE1_SCHEMA_CACHE_SIZE", 1000)
+
+# Field names that are preferred when a table links to the same target table more
+# than once.
+RELATION_NAME_HINTS = {
+    "Courses": ("course", "parent_course", "related_course"),
+    "Users": ("user", "student", "learner"),
+    "Lessons": ("lesson", "parent_lesson", "related_lesson", "lesson_link", "module"),
+    "Quiz": ("quiz",),
+}
+
+
+class SchemaError(Exception):
+    """Raised when the Teople database or one of its tables can't be found."""
+
+
+class TableSchema:
+    """
+    Everything the API needs to know about one Baserow table, resolved once: the
+    table, its generated model, the field objects indexed by name and column, a
+    compiled row serializer and a compiled write plan.
+    """
+
+    def __init__(self, table, model):
+        self.table = table
+        self.model = model
+        self.field_objects = model.get_field_objects()
+        self.by_name = {fo["field"].name: fo for fo in self.field_objects}
+        self.by_column = {fo["name"]: fo for fo in self.field_objects}
+        self.serializer = RowSerializer(self.field_objects, table.name)
+        self.loaded_at = time.monotonic()
+        self._relations = {}
+        self._write_plan = None
+        self._link_targets = None
+        self.link_columns = [
+            fo["name"] for fo in self.field_objects if fo["type"].type == "link_row"
+        ]
+        self.primary_column = next(
+            (fo["name"] for fo in self.field_objects if fo["field"].primary), None
+        )
+
+    @property
+    def write_plan(self):
+        # Compiled on first write because it loads the select options.
+        if self._write_plan is None:
+            self._write_plan = WritePlan(self.field_objects)
+        return self._write_plan
+
+    @property
+    def link_targets(self):
+        """`link_row column -> target table name`, loaded with one query."""
+
+        if self._link_targets is None:
+            table_ids = {
+                self.by_column[column]["field"].link_row_table_id
+                for column in self.link_columns
+            }
+            names = dict(
+                Table.objects.filter(id__in=table_ids).values_list("id", "name")
+            )
+            self._link_targets = {
+                column: names.get(self.by_column[column]["field"].link_row_table_id)
+                for column in self.link_columns
+            }
+        return self._link_targets
+
+    def enhance(self, queryset):
+        """
+        Like `enhance_by_fields`, except that link_row fields aren't prefetched.
+        Their ids are read from the through tables by `load_links` instead.
+        """
+
+        for fo in self.field_objects:
+            if fo["type"].type != "link_row":
+                queryset = fo["type"].enhance_queryset(
+                    queryset, fo["field"], fo["name"]
+                )
+        return queryset
+
+    @property
+    def expired(self):
+        return time.monotonic() - self.loaded_at > SCHEMA_TTL
+
+    def column(self, name):
+        """Returns the `field_{id}` column of the field with the given name."""
+
+        field_object = self.by_name.get(name)
+        return field_object["name"] if field_object else None
+
+    def serialize(self, row, links=None):
+        return self.serializer.serialize(row, links)
+
+    def serialize_many(self, rows, links=None):
+        return self.serializer.serialize_many(rows, links)
+
+    def serialize_columns(self, rows, links=None):
+        return self.serializer.serialize_columns(rows, links)
+
+    def relation_column(self, target_table, prefer=None):
+        """
+        Finds the link_row column pointing to the table named `target_table`. When
+        several fields link to it, the one named `prefer` or one of the common
+        relation names wins. The result is memoized on the schema.
+        """
+
+        key = (target_table, prefer)
+        if key not in self._relations:
+            self._relations[key] = self._find_relation_column(target_table, prefer)
+        return self._relations[key]
+
+    def _find_relation_column(self, target_table, prefer):
+        target_ids = get_table_ids(self.table.database_id, target_table)
+        candidates = [
+            fo
+            for fo in self.field_objects
+            if fo["type"].type == "link_row"
+            and fo["field"].link_row_table_id in target_ids
+        ]
+        if not candidates:
+            return None
+
+        names = ((prefer,) if prefer else ()) + RELATION_NAME_HINTS.get(
+            target_table, ()
+        )
+        for name in names:
+            for fo in candidates:
+                if fo["field"].name == name:
+                    return fo["name"]
+        return candidates[0]["name"]
+
+
+# `(database id, table name) -> TableSchema` of every tenant, bounded so the
+# generated models of many tenants can't grow memory without limit.
+schemas = LRUCache(SCHEMA_CACHE_SIZE)
+
+
+def get_table_schema(table_name):
+    """
+    Returns the cached `TableSchema` of the table with the given name in the
+    current tenant's database, generating the model only when there is no fresh
+    entry. Within a request the same schema is returned every time.
+    """
+
+    try:
+        database_id = get_current_database_id()
+    except TenantNotFound as e:
+        raise SchemaError(str(e))
+
+    return memoized(
+        ("schema", database_id, table_name), _load_table_schema, database_id, table_name
+    )
+
+
+def _load_table_schema(database_id, table_name):
+    key = (database_id, table_name)
+    schema = schemas.get(key)
+    if schema is not None and not schema.expired:
+        return schema
+
+    try:
+        table = Table.objects.get(database_id=database_id, name=table_name)
+    except Table.DoesNotExist:
+        logger.error("Table '%s' not found", table_name)
+        raise SchemaError(f"Table '{table_name}' not found in database.")
+
+    schema = TableSchema(table, get_table_model(table))
+    schemas.set(key, schema)
+    return schema
+
+
+def get_table_ids(database_id, name):
+    """Ids of the tables named `name` in the database, queried once per request."""
+
+    return memoized(
+        ("table_ids", database_id, name), _query_table_ids, database_id, name
+    )
+
+
+def _query_table_ids(database_id, name):
+    return frozenset(
+        Table.objects.filter(database_id=database_id, name=name).values_list(
+            "id", flat=True
+        )
+    )
+
+
+def invalidate_schema(table_name=None):
+    """
+    Drops the cached schema of one table of the current tenant, or everything
+    cached about all tenants.
+    """
+
+    forget()
+    if table_name is None:
+        schemas.clear()
+        table_models.clear()
+        forget_databases()
+    else:
+        schemas.delete_many([(get_current_database_id(), table_name)])
+
+
+def get_relation_field_id(table_name, target_table, prefer=None):
+    """Returns the link_row column in `table_name` that points to `target_table`."""
+
+    column = get_table_schema(table_name).relation_column(target_table, prefer)
+    if column is None and sampler.sample((table_name, target_table)) is not None:
+        logger.error(
+            "No link_row field found in %s linking to %s", table_name, target_table
+        )
+    return column
+
+
+def ensure_required_relationships(table_name, required):
+    """
+    Makes sure `table_name` has a link_row field for every `name -> target table`
+    pair in `required`, creating missing ones, and returns `name -> column`.
+    """
+
+    schema = get_table_schema(table_name)
+    columns = {}
+    missing = {}
+    for name, target_table in required.items():
+        column = schema.relation_column(target_table, prefer=name)
+        if column is None:
+            missing[name] = target_table
+        else:
+            columns[name] = column
+
+    if not missing:
+        return columns
+
+    with transaction.atomic():
+        order = len(schema.field_objects)
+        for name, target_table in missing.items():
+            target = get_table_schema(target_table).table
+            field = Field.objects.create(
+                table=schema.table,
+                name=name,
+                type="link_row",
+                link_row_table=target,
+                order=order,
+            )
+            order += 1
+            logger.info(
+                "Created %s link in %s table (ID: %s)", name, table_name, field.id
+            )
+            columns[name] = f"field_{field.id}"
+
+    from ..invalidation import publish_schema
+
+    # The new fields aren't on the replica yet, read them back from the primary.
+    pin_primary()
+    publish_schema([schema.table.id])
+    return columns
@@ -0,0 +1,115 @@
+import logging
+from datetime import date, time
+from decimal import Decimal
+
+from .logs import FieldErrors
+
+logger = logging.getLogger(__name__)
+
+# Values of these field types are returned as they are, the renderer encodes
+# decimals, dates and datetimes.
+NATIVE_FIELD_TYPES = {"number", "boolean", "date", "created_on", "last_modified"}
+NATIVE_VALUE_TYPES = (str, int, float, list, dict, Decimal, date, time)
+
+
+def serialize_link_row(value):
+    if hasattr(value, "all"):
+        return [obj.id for obj in value.all()]
+    return getattr(value, "id", None)
+
+
+def serialize_select_option(option):
+    return {"id": option.id, "value": option.value, "color": option.color}
+
+
+def serialize_single_select(value):
+    return serialize_select_option(value) if hasattr(value, "value") else None
+
+
+def serialize_multiple_select(value):
+    options = value.all() if hasattr(value, "all") else value
+    return [serialize_select_option(option) for option in options or []]
+
+
+def serialize_default(value):
+    return value if isinstance(value, NATIVE_VALUE_TYPES) else str(value)
+
+
+FIELD_SERIALIZERS = {
+    "link_row": serialize_link_row,
+    "single_select": serialize_single_select,
+    "multiple_select": serialize_multiple_select,
+}
+
+
+def get_field_serializer(field_type):
+    """Returns the serializer of a field type, None when values are native."""
+
+    if field_type in NATIVE_FIELD_TYPES:
+        return None
+    return FIELD_SERIALIZERS.get(field_type, serialize_default)
+
+
+class RowSerializer:
+    """
+    Converts rows of one table to dicts. The serializer of every field is resolved
+    once when the table schema is loaded instead of per row and per cell.
+    """
+
+    meta_columns = ["id", "order", "created_on", "updated_on"]
+
+    def __init__(self, field_objects, table_name=""):
+        self.table_name = table_name
+        self.fields = [
+            (fo["field"].name, fo["name"], get_field_serializer(fo["type"].type))
+            for fo in field_objects
+        ]
+        self.columns = self.meta_columns + [name for name, _, _ in self.fields]
+
+    def get_values(self, row, links=None, errors=None):
+        """
+        Returns the values of `row` in the order of `columns`. `links` maps link
+        columns to `row id -> value` loaded for many rows at once, other link
+        columns are read from the row. Values that can't be read are None and
+        counted in `errors`.
+        """
+
+        values = [
+            row.id,
+            str(row.order) if hasattr(row, "order") else None,
+            row.created_on,
+            row.updated_on,
+        ]
+        for name, column, serialize in self.fields:
+            if links and column in links:
+                values.append(links[column].get(row.id, []))
+                continue
+            try:
+                value = getattr(row, column)
+                if value is not None and serialize is not None:
+                    value = serialize(value)
+                values.append(value)
+            except Exception as e:
+                if errors is not None:
+                    errors.add(name, e)
+                values.append(None)
+        return values
+
+    def serialize(self, row, links=None):
+        return self.serialize_many([row], links)[0]
+
+    def serialize_many(self, rows, links=None):
+        errors = FieldErrors()
+        data = [
+            dict(zip(self.columns, self.get_values(row, links, errors))) for row in rows
+        ]
+        errors.log(logger, self.table_name)
+        return data
+
+    def serialize_columns(self, rows, links=None):
+        """Returns `rows` as lists of values, without repeating the column names."""
+
+        errors = FieldErrors()
+        data = [self.get_values(row, links, errors) for row in rows]
+        errors.log(logger, self.table_name)
+        return data
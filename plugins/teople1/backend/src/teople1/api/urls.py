@@ -1,59 +1,129 @@
+from importlib import import_module
+
+from asgiref.sync import markcoroutinefunction
 from django.urls import re_path
-from .views import (
-    StartingView,
-    TasksView,
-    CategoriesView,
-    UserRegisterView,
-    UserLoginView,
-    UserLogoutView,
-    CoursesView,
-    LessonsView,
-    EnrollmentsView,
-    ProgressView,
-    QuizView,
-    QuestionsView,
-)
 
 app_name = "teople1.api"
 
+
+class LazyView:
+    """
+    A view for the class `name` of `views`, imported on the first request
+    instead of when the URLs load, so the plugin starts without the views and
+    everything they import. `cls` and `csrf_exempt` are the ones of the view
+    `as_view()` returns, for the CSRF middleware and the API schema generator.
+    """
+
+    def __init__(self, name, initkwargs):
+        self.__name__ = self.__qualname__ = name
+        self.initkwargs = initkwargs
+        self._view = None
+
+    @property
+    def view(self):
+        if self._view is None:
+            view_class = getattr(import_module("teople1.api.views"), self.__name__)
+            self._view = view_class.as_view(**self.initkwargs)
+        return self._view
+
+    @property
+    def cls(self):
+        return self.view.cls
+
+    @property
+    def csrf_exempt(self):
+        return getattr(self.view, "csrf_exempt", False)
+
+    def __call__(self, request, *args, **kwargs):
+        return self.view(request, *args, **kwargs)
+
+
+class AsyncLazyView(LazyView):
+    def __init__(self, name, initkwargs):
+        super().__init__(name, initkwargs)
+        markcoroutinefunction(self)
+
+    async def __call__(self, request, *args, **kwargs):
+        return await self.view(request, *args, **kwargs)
+
+
+def lazy_view(name, is_async=False, **initkwargs):
+    return (AsyncLazyView if is_async else LazyView)(name, initkwargs)
+
+
+def table_urls(prefix, view, name, detail_name):
+    """List, detail and batch routes of the `TableResource` view named `view`."""
+
+    return [
+        re_path(rf"{prefix}/$", lazy_view(view), name=name),
+        re_path(rf"{prefix}/(?P<row_id>\d+)/$", lazy_view(view), name=detail_name),
+        re_path(
+            rf"{prefix}/batch/$",
+            lazy_view(view, action="batch_create"),
+            name=f"{name}_batch",
+        ),
+        re_path(
+            rf"{prefix}/batch_delete/$",
+            lazy_view(view, action="batch_delete"),
+            name=f"{name}_batch_delete",
+        ),
+    ]
+
+
 urlpatterns = [
     # Starting endpoint
-    re_path(r"starting/$", StartingView.as_view(), name="starting"),
+    re_path(r"starting/$", lazy_view("StartingView"), name="starting"),
 
-    # Tasks endpoints
-    re_path(r"tasks/$", TasksView.as_view(), name="tasks"),
-    re_path(r"tasks/(?P<task_id>\d+)/$", TasksView.as_view(), name="task_detail"),
+    # User authentication endpoints
+    re_path(r"users/register/$", lazy_view("UserRegisterView"), name="user_register"),
+    re_path(r"users/login/$", lazy_view("UserLoginView"), name="user_login"),
+    re_path(r"users/logout/$", lazy_view("UserLogoutView"), name="user_logout"),
 
-    # Categories endpoints
-    re_path(r"categories/$", CategoriesView.as_view(), name="categories"),
-    re_path(r"categories/(?P<category_id>\d+)/$", CategoriesView.as_view(), name="category_detail"),
+    re_path(r"search/$", lazy_view("SearchView"), name="search"),
+    re_path(r"cache/stats/$", lazy_view("CacheStatsView"), name="cache_stats"),
 
-    # User authentication endpoints
-    re_path(r"users/register/$", UserRegisterView.as_view(), name="user_register"),
-    re_path(r"users/login/$", UserLoginView.as_view(), name="user_login"),
-    re_path(r"users/logout/$", UserLogoutView.as_view(), name="user_logout"),
-
-    # Courses endpoints
-    re_path(r"courses/$", CoursesView.as_view(), name="courses"),
-    re_path(r"courses/(?P<course_id>\d+)/$", CoursesView.as_view(), name="course_detail"),
-
-    # Lessons endpoints
-    re_path(r"lessons/$", LessonsView.as_view(), name="lessons"),
-    re_path(r"lessons/(?P<lesson_id>\d+)/$", LessonsView.as_view(), name="lesson_detail"),
-
-    # Enrollments endpoints
-    re_path(r"enrollments/$", EnrollmentsView.as_view(), name="enrollments"),
-    re_path(r"enrollments/(?P<enrollment_id>\d+)/$", EnrollmentsView.as_view(), name="enrollment_detail"),
-
-    # Progress endpoints
-    re_path(r"progress/$", ProgressView.as_view(), name="progress"),
-    re_path(r"progress/(?P<progress_id>\d+)/$", ProgressView.as_view(), name="progress_detail"),
-
-    # Quiz endpoints (new)
-    re_path(r"quizzes/$", QuizView.as_view(), name="quizzes"),
-    re_path(r"quizzes/(?P<quiz_id>\d+)/$", QuizView.as_view(), name="quiz_detail"),
-
-    # Questions endpoints (new)
-    re_path(r"questions/$", QuestionsView.as_view(), name="questions"),
-    re_path(r"questions/(?P<question_id>\d+)/$", QuestionsView.as_view(), name="question_detail"),
-]
\ No newline at end of file
+    # Table endpoints
+    *table_urls("tasks", "TasksView", "tasks", "task_detail"),
+    *table_urls("categories", "CategoriesView", "categories", "category_detail"),
+    *table_urls("courses", "CoursesView", "courses", "course_detail"),
+    re_path(
+        r"courses/(?P<row_id>\d+)/clone/$",
+        lazy_view("CoursesView", action="clone"),
+        name="course_clone",
+    ),
+    re_path(
+        r"courses/(?P<row_id>\d+)/overview/$",
+        lazy_view("CourseOverviewView", is_async=True),
+        name="course_overview",
+    ),
+    re_path(
+        r"courses/(?P<row_id>\d+)/cascade/$",
+        lazy_view("CoursesView", action="cascade_delete"),
+        name="course_cascade_delete",
+    ),
+    *table_urls("lessons", "LessonsView", "lessons", "lesson_detail"),
+    re_path(
+        r"enrollments/bulk/$",
+        lazy_view("EnrollmentsView", action="bulk"),
+        name="enrollments_bulk",
+    ),
+    re_path(
+        r"enrollments/bulk/(?P<job_id>\d+)/$",
+        lazy_view("EnrollmentJobView"),
+        name="enrollment_job",
+    ),
+    *table_urls("enrollments", "EnrollmentsView", "enrollments", "enrollment_detail"),
+    re_path(
+        r"progress/summary/$",
+        lazy_view("CourseProgressView"),
+        name="course_progress",
+    ),
+    re_path(
+        r"progress/upsert/$",
+        lazy_view("ProgressView", action="upsert"),
+        name="progress_upsert",
+    ),
+    *table_urls("progress", "ProgressView", "progress", "progress_detail"),
+    *table_urls("quizzes", "QuizView", "quizzes", "quiz_detail"),
+    *table_urls("questions", "QuestionsView", "questions", "question_detail"),
+]
@@ -1,14 +1,26 @@
 from baserow.core.registries import plugin_registry
 from django.apps import AppConfig
+from django.conf import settings
 
 
 class PluginNameConfig(AppConfig):
     name = "teople1"
+    default_auto_field = "django.db.models.AutoField"
 
     def ready(self):
+        from baserow.ws.registries import page_registry
+
+        from . import signals  # noqa: F401
         from .plugins import PluginNamePlugin
+        from .realtime import CoursePageType
 
         plugin_registry.register(PluginNamePlugin())
+        page_registry.register(CoursePageType())
+
+        if getattr(settings, "TEOPLE1_WARM_UP", False):
+            from .warmup import start_warm_up
+
+            start_warm_up()
 
 
 # from django.apps import AppConfig
@@ -0,0 +1,67 @@
+import gzip
+import re
+import zlib
+
+from django.conf import settings
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+# Responses smaller than this aren't worth the CPU, they fit in a few packets.
+DEFAULT_MIN_LENGTH = 1024
+# Middle levels, not tuned on measurements. Compare the levels on real data with
+# the benchmark_compression command before changing them.
+DEFAULT_BROTLI_QUALITY = 4
+DEFAULT_GZIP_LEVEL = 6
+
+re_accepts_br = re.compile(r"\bbr\b")
+re_accepts_gzip = re.compile(r"\bgzip\b")
+
+
+def get_min_length():
+    return getattr(settings, "TEOPLE1_COMPRESS_MIN_LENGTH", DEFAULT_MIN_LENGTH)
+
+
+def get_brotli_quality():
+    return getattr(settings, "TEOPLE1_BROTLI_QUALITY", DEFAULT_BROTLI_QUALITY)
+
+
+def get_gzip_level():
+    return getattr(settings, "TEOPLE1_GZIP_LEVEL", DEFAULT_GZIP_LEVEL)
+
+
+def choose_encoding(accept_encoding):
+    """Returns "br" or "gzip" for an Accept-Encoding header, or None."""
+
+    if brotli is not None and re_accepts_br.search(accept_encoding):
+        return "br"
+    if re_accepts_gzip.search(accept_encoding):
+        return "gzip"
+    return None
+
+
+def compress(content, encoding, level=None):
+    if encoding == "br":
+        quality = get_brotli_quality() if level is None else level
+        return brotli.compress(content, quality=quality)
+    level = get_gzip_level() if level is None else level
+    return gzip.compress(content, compresslevel=level, mtime=0)
+
+
+def compress_stream(chunks, encoding):
+    """Compresses an iterator of byte chunks, flushing after every chunk."""
+
+    if encoding == "br":
+        compressor = brotli.Compressor(quality=get_brotli_quality())
+        for chunk in chunks:
+            yield compressor.process(chunk) + compressor.flush()
+        yield compressor.finish()
+        return
+
+    compressor = zlib.compressobj(get_gzip_level(), zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        yield compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+    yield compressor.flush()
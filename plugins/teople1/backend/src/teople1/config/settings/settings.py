@@ -1,3 +1,7 @@
+import json
+import os
+
+
 def setup(settings):
     """
     This function is called after Baserow as setup its own Django settings file but
@@ -8,3 +12,78 @@ def setup(settings):
     for db, value in settings.DATABASES:
         value['engine'] = 'some custom engine'
     """
+
+    # Optionally keep database connections open between requests, checked before
+    # reuse so a restarted database doesn't cause errors. Off unless configured:
+    # under ASGI Django doesn't reuse them per request and they pile up.
+    database = settings.DATABASES["default"]
+    if "TEOPLE1_CONN_MAX_AGE" in os.environ:
+        database["CONN_MAX_AGE"] = int(os.environ["TEOPLE1_CONN_MAX_AGE"])
+        database["CONN_HEALTH_CHECKS"] = True
+
+    # Behind PgBouncer in transaction pooling mode a cursor can't outlive its
+    # transaction, so server side cursors must be off.
+    if os.getenv("TEOPLE1_PGBOUNCER", "").lower() in ("1", "true", "yes"):
+        database["DISABLE_SERVER_SIDE_CURSORS"] = True
+
+    # Send the reads of teople1 GET requests to a streaming replica when one is
+    # configured. Clients read from the primary for a few seconds after writing.
+    replica_host = os.getenv("TEOPLE1_REPLICA_HOST")
+    if replica_host:
+        settings.DATABASES["replica"] = {
+            **database,
+            "HOST": replica_host,
+            "PORT": os.getenv("TEOPLE1_REPLICA_PORT", database.get("PORT", "")),
+            "TEST": {"MIRROR": "default"},
+        }
+        settings.TEOPLE1_REPLICA_ALIAS = "replica"
+        settings.TEOPLE1_REPLICA_STICKY_SECONDS = int(
+            os.getenv("TEOPLE1_REPLICA_STICKY_SECONDS", "5")
+        )
+        settings.DATABASE_ROUTERS = [
+            "teople1.routers.ReplicaRouter",
+            *settings.get("DATABASE_ROUTERS", []),
+        ]
+
+    # Build the teople1 table models in the background when a process starts, so
+    # the first request doesn't. Meant for the web workers.
+    settings.TEOPLE1_WARM_UP = os.getenv("TEOPLE1_WARM_UP", "").lower() in (
+        "1",
+        "true",
+        "yes",
+    )
+
+    # Which Baserow database a teople1 request uses: the one mapped to its host
+    # ("host") or path prefix ("path") or, by default, always the database named
+    # TEOPLE1_DATABASE_NAME. The mappings are JSON objects of database ids.
+    settings.TEOPLE1_DATABASE_NAME = os.getenv("TEOPLE1_DATABASE_NAME", "Teople")
+    settings.TEOPLE1_TENANT_RESOLVER = os.getenv("TEOPLE1_TENANT_RESOLVER", "")
+    settings.TEOPLE1_TENANT_HOSTS = json.loads(os.getenv("TEOPLE1_TENANT_HOSTS", "{}"))
+    settings.TEOPLE1_TENANT_SLUGS = json.loads(os.getenv("TEOPLE1_TENANT_SLUGS", "{}"))
+    settings.TEOPLE1_SCHEMA_CACHE_SIZE = int(
+        os.getenv("TEOPLE1_SCHEMA_CACHE_SIZE", "1000")
+    )
+    settings.TEOPLE1_MODEL_CACHE_SIZE = int(
+        os.getenv("TEOPLE1_MODEL_CACHE_SIZE", "1000")
+    )
+
+    # Threads the async teople1 views run their queries on.
+    settings.TEOPLE1_READ_THREADS = int(os.getenv("TEOPLE1_READ_THREADS", "8"))
+
+    # Compress large teople1 API responses, Caddy compresses everything else.
+    settings.TEOPLE1_COMPRESS_MIN_LENGTH = int(
+        os.getenv("TEOPLE1_COMPRESS_MIN_LENGTH", "1024")
+    )
+    settings.TEOPLE1_BROTLI_QUALITY = int(os.getenv("TEOPLE1_BROTLI_QUALITY", "4"))
+    settings.TEOPLE1_GZIP_LEVEL = int(os.getenv("TEOPLE1_GZIP_LEVEL", "6"))
+
+    # `settings` only reads the values from before `setup`, so the middleware is
+    # added in one assignment.
+    settings.MIDDLEWARE = [
+        "teople1.middleware.CompressionMiddleware",
+        *settings.MIDDLEWARE,
+        *(["teople1.middleware.ReplicaMiddleware"] if replica_host else []),
+        "teople1.middleware.TenantMiddleware",
+        "teople1.middleware.InvalidationMiddleware",
+        "teople1.middleware.MemoMiddleware",
+    ]
@@ -0,0 +1,257 @@
+import logging
+
+from django.db import IntegrityError, transaction
+
+from .api.bulk import bulk_create_rows, bulk_delete_rows, read_links
+from .api.schema import ensure_required_relationships, get_table_schema
+from .models import EnrollmentJob, EnrollmentKey
+from .progress import get_course_lessons, get_progress_columns, refresh_pairs
+from .realtime import publish_changes
+
+
+logger = logging.getLogger(__name__)
+
+ENROLL_BATCH_SIZE = 500
+
+ENROLLMENT_RELATIONSHIPS = {"course": "Courses", "user": "Users"}
+
+
+class DuplicateEnrollment(IntegrityError):
+    """Raised when a write would enroll a user in the same course twice."""
+
+
+def get_enrollment_columns():
+    """Returns the Enrollments schema and its course and user columns."""
+
+    schema = get_table_schema("Enrollments")
+    columns = ensure_required_relationships("Enrollments", ENROLLMENT_RELATIONSHIPS)
+    return schema, columns["course"], columns["user"]
+
+
+def get_enrolled_users(course_id, user_ids):
+    """
+    Returns the users of `user_ids` enrolled in the course. Users without a key
+    are looked up in the Enrollments links, in case their rows were changed
+    without the keys being updated.
+    """
+
+    user_ids = set(user_ids)
+    enrolled = set(
+        EnrollmentKey.objects.filter(
+            course_id=course_id, user_id__in=user_ids
+        ).values_list("user_id", flat=True)
+    )
+    missing = user_ids - enrolled
+    if missing:
+        schema, course, user = get_enrollment_columns()
+        enrolled.update(
+            schema.model.objects.filter(
+                **{course: course_id, f"{user}__in": missing}
+            ).values_list(user, flat=True)
+        )
+    return enrolled & user_ids
+
+
+def is_enrolled(user_id, course_id):
+    return bool(get_enrolled_users(course_id, [user_id]))
+
+
+def build_enrollment_keys(enrollment_ids):
+    """Returns unsaved keys for every course and user the given rows link to."""
+
+    schema, course, user = get_enrollment_columns()
+    enrollment_ids = list(enrollment_ids)
+    courses = read_links(schema.model, course, enrollment_ids)
+    users = read_links(schema.model, user, enrollment_ids)
+    return [
+        EnrollmentKey(enrollment_id=enrollment_id, user_id=user_id, course_id=course_id)
+        for enrollment_id in enrollment_ids
+        for course_id in courses.get(enrollment_id, [])
+        for user_id in users.get(enrollment_id, [])
+    ]
+
+
+def add_enrollment_keys(keys):
+    """Inserts `keys`, raising `DuplicateEnrollment` if a pair already exists."""
+
+    try:
+        with transaction.atomic():
+            EnrollmentKey.objects.bulk_create(keys)
+    except IntegrityError:
+        raise DuplicateEnrollment("User already enrolled in this course")
+
+
+def sync_enrollment_keys(enrollment_ids):
+    """
+    Replaces the keys of the given Enrollments rows by their current links, rows
+    that were deleted lose their keys.
+    """
+
+    enrollment_ids = list(enrollment_ids)
+    EnrollmentKey.objects.filter(enrollment_id__in=enrollment_ids).delete()
+    add_enrollment_keys(build_enrollment_keys(enrollment_ids))
+
+
+def track_enrollments(enrollment_ids):
+    """
+    Like `sync_enrollment_keys` for rows changed in Baserow, where a duplicate
+    can't be rejected anymore. Duplicates don't get a key and are logged.
+    """
+
+    enrollment_ids = list(enrollment_ids)
+    EnrollmentKey.objects.filter(enrollment_id__in=enrollment_ids).delete()
+    keys = build_enrollment_keys(enrollment_ids)
+    if not keys:
+        return
+
+    taken = set(
+        EnrollmentKey.objects.filter(
+            user_id__in={key.user_id for key in keys},
+            course_id__in={key.course_id for key in keys},
+        ).values_list("user_id", "course_id")
+    )
+    unique = []
+    for key in keys:
+        pair = (key.user_id, key.course_id)
+        if pair in taken:
+            logger.warning(
+                "Enrollments row %s enrolls user %s in course %s again",
+                key.enrollment_id,
+                *pair,
+            )
+        else:
+            taken.add(pair)
+            unique.append(key)
+    EnrollmentKey.objects.bulk_create(unique, ignore_conflicts=True)
+
+
+def forget_enrollments(enrollment_ids):
+    EnrollmentKey.objects.filter(enrollment_id__in=list(enrollment_ids)).delete()
+
+
+def rebuild_enrollment_keys():
+    """
+    Rebuilds all keys from the Enrollments table. When a pair is enrolled more
+    than once only the first row gets the key.
+    """
+
+    schema, _, _ = get_enrollment_columns()
+    ids = list(schema.model.objects.order_by("id").values_list("id", flat=True))
+    count = 0
+    with transaction.atomic():
+        EnrollmentKey.objects.all().delete()
+        for start in range(0, len(ids), ENROLL_BATCH_SIZE):
+            keys = build_enrollment_keys(ids[start : start + ENROLL_BATCH_SIZE])
+            EnrollmentKey.objects.bulk_create(keys, ignore_conflicts=True)
+            count += len(keys)
+    return count
+
+
+def create_initial_progress(course_id, user_ids, lesson_ids):
+    """
+    Creates one uncompleted Progress row per user and lesson that doesn't have one
+    yet with a single INSERT and returns how many were created.
+    """
+
+    schema, user, course, lesson, _ = get_progress_columns()
+    if not (user and course and lesson) or not user_ids or not lesson_ids:
+        return 0
+
+    existing = set(
+        schema.model.objects.filter(
+            **{course: course_id, f"{user}__in": user_ids}
+        ).values_list(user, lesson)
+    )
+    prepared = [
+        ({}, {course: [course_id], user: [user_id], lesson: [lesson_id]})
+        for user_id in user_ids
+        for lesson_id in sorted(lesson_ids)
+        if (user_id, lesson_id) not in existing
+    ]
+    rows = bulk_create_rows(schema.model, prepared)
+    refresh_pairs({(user_id, course_id) for user_id in user_ids})
+    publish_changes("Progress", [row.id for row in rows])
+    return len(prepared)
+
+
+def enroll_batch(course_id, user_ids, lesson_ids):
+    """
+    Enrolls the users of `user_ids` that aren't enrolled in the course yet and
+    creates their initial progress. Returns `(enrolled, skipped user ids,
+    progress)`.
+    """
+
+    schema, course, user = get_enrollment_columns()
+    enrolled = get_enrolled_users(course_id, user_ids)
+    new_user_ids = [user_id for user_id in user_ids if user_id not in enrolled]
+    rows = bulk_create_rows(
+        schema.model,
+        [({}, {course: [course_id], user: [user_id]}) for user_id in new_user_ids],
+    )
+    EnrollmentKey.objects.bulk_create(
+        [
+            EnrollmentKey(enrollment_id=row.id, user_id=user_id, course_id=course_id)
+            for row, user_id in zip(rows, new_user_ids)
+        ],
+        ignore_conflicts=True,
+    )
+
+    # Users a concurrent request enrolled since the check above already have a
+    # key, their rows are removed again.
+    keyed = set(
+        EnrollmentKey.objects.filter(
+            enrollment_id__in=[row.id for row in rows]
+        ).values_list("enrollment_id", flat=True)
+    )
+    bulk_delete_rows(schema.model, [row.id for row in rows if row.id not in keyed])
+    enrolled_ids = {
+        user_id for row, user_id in zip(rows, new_user_ids) if row.id in keyed
+    }
+
+    publish_changes("Enrollments", sorted(keyed))
+    progress = create_initial_progress(
+        course_id,
+        [user_id for user_id in user_ids if user_id in enrolled_ids],
+        lesson_ids,
+    )
+    skipped = [user_id for user_id in user_ids if user_id not in enrolled_ids]
+    return len(enrolled_ids), skipped, progress
+
+
+def run_enrollment_job(job_id):
+    """
+    Processes a pending or interrupted job in batches of `ENROLL_BATCH_SIZE`
+    users. Every batch is committed together with the job counters, so a job
+    that is run again continues after the last committed batch.
+    """
+
+    job = EnrollmentJob.objects.get(id=job_id)
+    if job.state in (EnrollmentJob.FINISHED, EnrollmentJob.FAILED):
+        return job
+
+    job.state = EnrollmentJob.RUNNING
+    job.save(update_fields=["state", "updated_on"])
+    counters = ["processed_count", "enrolled_count", "skipped_count", "progress_count"]
+
+    try:
+        lesson_ids = get_course_lessons([job.course_id])[job.course_id]
+        for start in range(job.processed_count, len(job.user_ids), ENROLL_BATCH_SIZE):
+            batch = job.user_ids[start : start + ENROLL_BATCH_SIZE]
+            with transaction.atomic():
+                enrolled, skipped, progress = enroll_batch(
+                    job.course_id, batch, lesson_ids
+                )
+                job.processed_count += len(batch)
+                job.enrolled_count += enrolled
+                job.skipped_count += len(skipped)
+                job.skipped_user_ids += skipped
+                job.progress_count += progress
+                job.save(update_fields=counters + ["skipped_user_ids", "updated_on"])
+    except Exception as e:
+        logger.exception("Enrollment job %s failed: %s", job.id, e)
+        job.state = EnrollmentJob.FAILED
+        job.error = str(e)
+    else:
+        job.state = EnrollmentJob.FINISHED
+    job.save(update_fields=["state", "error", "updated_on"])
+    return job
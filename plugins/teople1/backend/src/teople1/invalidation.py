@@ -0,0 +1,175 @@
+import logging
+from threading import Lock
+
+from django.core.cache import cache
+from django.db import transaction
+
+from .api.links import display_tables, display_values, forget_display_values
+from .api.logs import sampler
+from .api.model_cache import forget_table_models
+from .api.schema import schemas
+from .memo import forget
+from .tenants import get_tenant_database_ids
+
+
+logger = logging.getLogger(__name__)
+
+# Moves on every schema change, requests only compare the table versions when it
+# moved.
+EPOCH_KEY = "teople1:invalidation:epoch"
+# Number of the last published row change, the changes are kept for
+# `ROWS_TIMEOUT` seconds under `rows_key(number)`.
+ROWS_KEY = "teople1:invalidation:rows"
+ROWS_TIMEOUT = 300
+# A process further behind than this drops all display values instead of reading
+# the changes one by one.
+MAX_ROW_CHANGES = 500
+
+_lock = Lock()
+# The epoch, `table id -> schema version` and row change this process last
+# applied.
+_seen = {"epoch": None, "versions": {}, "rows": None}
+
+
+def version_key(table_id):
+    return f"teople1:invalidation:schema:{table_id}"
+
+
+def rows_key(number):
+    return f"{ROWS_KEY}:{number}"
+
+
+def is_tenant_table(table):
+    """Whether `table` is in a database served by the teople1 API."""
+
+    return table.database_id in get_tenant_database_ids()
+
+
+def forget_schemas(table_ids):
+    """Drops this process' cached schemas, models and values of the tables."""
+
+    table_ids = set(table_ids)
+    schemas.delete_many(
+        [key for key, schema in schemas.items() if schema.table.id in table_ids]
+    )
+    forget_table_models(table_ids)
+    forget()
+    display_values.delete_where(lambda key: key[0] in table_ids)
+
+
+def publish_schema(table_ids):
+    """
+    Drops the cached entries of the tables in this process right away and, once
+    the transaction commits, bumps their versions in the shared cache so every
+    other worker drops them on its next request. Without a shared cache only
+    this process is invalidated.
+    """
+
+    table_ids = set(table_ids)
+    if not table_ids:
+        return
+    forget_schemas(table_ids)
+    transaction.on_commit(lambda: bump_versions(table_ids))
+
+
+def publish_rows(table_id, row_ids):
+    """
+    Drops the display values of the rows in this process and, once the
+    transaction commits, in every other worker.
+    """
+
+    row_ids = list(row_ids)
+    if not row_ids:
+        return
+    forget_display_values(table_id, row_ids)
+    transaction.on_commit(lambda: log_rows(table_id, row_ids))
+
+
+def bump_versions(table_ids):
+    forget_schemas(table_ids)
+    try:
+        for table_id in table_ids:
+            key = version_key(table_id)
+            cache.add(key, 0, timeout=None)
+            version = cache.incr(key)
+            # This process already dropped its entries.
+            with _lock:
+                _seen["versions"][key] = version
+        cache.add(EPOCH_KEY, 0, timeout=None)
+        cache.incr(EPOCH_KEY)
+    except Exception as e:
+        if sampler.sample(("invalidation", type(e))) is not None:
+            logger.warning("Couldn't publish schema changes to other workers: %s", e)
+
+
+def log_rows(table_id, row_ids):
+    forget_display_values(table_id, row_ids)
+    try:
+        cache.add(ROWS_KEY, 0, timeout=None)
+        number = cache.incr(ROWS_KEY)
+        cache.set(rows_key(number), (table_id, row_ids), timeout=ROWS_TIMEOUT)
+    except Exception as e:
+        if sampler.sample(("invalidation", type(e))) is not None:
+            logger.warning("Couldn't publish row changes to other workers: %s", e)
+
+
+def get_cached_tables():
+    """`table id` of everything this process caches per table."""
+
+    return {schema.table.id for _, schema in schemas.items()} | display_tables
+
+
+def sync():
+    """
+    Applies the schema and row changes other workers published since the last
+    call. Costs one cache read when nothing changed, called at the start of
+    every request.
+    """
+
+    try:
+        state = cache.get_many([EPOCH_KEY, ROWS_KEY])
+        epoch, rows = state.get(EPOCH_KEY), state.get(ROWS_KEY, 0)
+        if epoch != _seen["epoch"]:
+            sync_schemas(epoch)
+        if rows != _seen["rows"]:
+            sync_rows(rows)
+    except Exception as e:
+        if sampler.sample(("invalidation", type(e))) is not None:
+            logger.warning("Couldn't read the changes of other workers: %s", e)
+
+
+def sync_schemas(epoch):
+    keys = {version_key(table_id): table_id for table_id in get_cached_tables()}
+    versions = cache.get_many(list(keys))
+
+    changed = set()
+    with _lock:
+        for key, table_id in keys.items():
+            version = versions.get(key)
+            if version is not None and version != _seen["versions"].get(key):
+                changed.add(table_id)
+                _seen["versions"][key] = version
+        _seen["epoch"] = epoch
+
+    if changed:
+        forget_schemas(changed)
+
+
+def sync_rows(rows):
+    with _lock:
+        last, _seen["rows"] = _seen["rows"], rows
+    # Nothing is cached from before the first request of the process.
+    if last is None:
+        return
+
+    numbers = range(last + 1, rows + 1)
+    changes = {}
+    if len(numbers) <= MAX_ROW_CHANGES:
+        changes = cache.get_many([rows_key(number) for number in numbers])
+    if rows < last or len(changes) < len(numbers):
+        # The cache was cleared, changes expired or there are too many to read,
+        # don't risk keeping stale values.
+        display_values.clear()
+        return
+    for table_id, row_ids in changes.values():
+        forget_display_values(table_id, row_ids)
@@ -0,0 +1,51 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from teople1.api.links import load_links
+from teople1.api.renderers import FastJSONRenderer
+from teople1.api.schema import get_table_schema
+from teople1.compression import brotli, compress
+
+
+# `(encoding, level)` pairs compared by the benchmark.
+LEVELS = [
+    ("gzip", 1),
+    ("gzip", 6),
+    ("gzip", 9),
+    ("br", 1),
+    ("br", 4),
+    ("br", 6),
+    ("br", 11),
+]
+
+
+class Command(BaseCommand):
+    help = (
+        "Renders the list response of a Teople table and compares the size and "
+        "CPU time of gzip and Brotli at several levels."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--table", default="Progress")
+        parser.add_argument("--repeat", type=int, default=5)
+
+    def handle(self, *args, **options):
+        schema = get_table_schema(options["table"])
+        rows = list(schema.enhance(schema.model.objects.all()))
+        links = load_links(schema, rows)
+        data = {"status": "success", "rows": schema.serialize_many(rows, links)}
+        content = FastJSONRenderer().render(data)
+        self.stdout.write(f"{options['table']}: {len(content)} bytes uncompressed")
+
+        for encoding, level in LEVELS:
+            if encoding == "br" and brotli is None:
+                continue
+            start = time.perf_counter()
+            for _ in range(options["repeat"]):
+                compressed = compress(content, encoding, level)
+            elapsed = (time.perf_counter() - start) / options["repeat"] * 1000
+            self.stdout.write(
+                f"{encoding:>4} {level:>2}: {len(compressed):>10} bytes "
+                f"({len(compressed) / len(content):6.1%}) in {elapsed:8.2f} ms"
+            )
@@ -0,0 +1,44 @@
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = (
+        "Sends concurrent GET requests to a URL and prints requests per second "
+        "and latency percentiles. Run it before and after a configuration change, "
+        "e.g. with and without PgBouncer."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("url")
+        parser.add_argument("--concurrency", type=int, default=16)
+        parser.add_argument("--requests", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_maxsize=options["concurrency"])
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+
+        def timed_get(_):
+            start = time.perf_counter()
+            response = session.get(options["url"])
+            return time.perf_counter() - start, response.status_code
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=options["concurrency"]) as executor:
+            results = list(executor.map(timed_get, range(options["requests"])))
+        elapsed = time.perf_counter() - start
+
+        latencies = sorted(latency * 1000 for latency, _ in results)
+        errors = sum(1 for _, status in results if status >= 400)
+        p95 = latencies[int(len(latencies) * 0.95) - 1]
+        self.stdout.write(
+            f"{len(results) / elapsed:.1f} req/s, "
+            f"p50 {statistics.median(latencies):.1f} ms, p95 {p95:.1f} ms, "
+            f"{errors} errors"
+        )
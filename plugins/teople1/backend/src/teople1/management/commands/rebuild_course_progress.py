@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from teople1.progress import rebuild_course_progress
+from teople1.tenants import get_current_database_id, use_database
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuilds the materialized per user course progress counters from the "
+        "Teople Progress and Lessons tables."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--database",
+            type=int,
+            help="Id of the tenant's Baserow database, the default tenant if omitted.",
+        )
+
+    def handle(self, *args, **options):
+        with use_database(options["database"] or get_current_database_id()):
+            count = rebuild_course_progress()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt progress of {count} pairs."))
@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from teople1.enrollment import rebuild_enrollment_keys
+from teople1.tenants import get_current_database_id, use_database
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuilds the indexed user and course keys used to detect duplicate "
+        "enrollments from the Teople Enrollments table."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--database",
+            type=int,
+            help="Id of the tenant's Baserow database, the default tenant if omitted.",
+        )
+
+    def handle(self, *args, **options):
+        with use_database(options["database"] or get_current_database_id()):
+            count = rebuild_enrollment_keys()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {count} enrollment keys."))
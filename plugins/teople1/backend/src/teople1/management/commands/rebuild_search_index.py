@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from teople1.search import rebuild_search_index
+from teople1.tenants import get_current_database_id, use_database
+
+
+class Command(BaseCommand):
+    help = "Rebuilds the full-text search index of the Teople Courses and Lessons."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--database",
+            type=int,
+            help="Id of the tenant's Baserow database, the default tenant if omitted.",
+        )
+
+    def handle(self, *args, **options):
+        with use_database(options["database"] or get_current_database_id()):
+            count = rebuild_search_index()
+        self.stdout.write(self.style.SUCCESS(f"Indexed {count} rows."))
@@ -0,0 +1,83 @@
+import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
+from threading import Lock
+
+
+logger = logging.getLogger(__name__)
+
+# Memo of the current request, None outside of `request_memo` where lookups
+# aren't memoized. Threads of the read pool inherit it from the request.
+current_memo = ContextVar("teople1_memo", default=None)
+
+_totals_lock = Lock()
+# Counters over all requests of this process, reported by the cache stats view.
+_totals = {"requests": 0, "lookups": 0, "saved": 0}
+
+
+class Memo:
+    """Values looked up during one request, keyed by what was looked up."""
+
+    def __init__(self):
+        self.values = {}
+        self.lookups = 0
+        self.saved = 0
+        self._lock = Lock()
+
+    def get(self, key, func, args):
+        with self._lock:
+            self.lookups += 1
+            if key in self.values:
+                self.saved += 1
+                return self.values[key]
+        value = func(*args)
+        with self._lock:
+            return self.values.setdefault(key, value)
+
+    def clear(self):
+        with self._lock:
+            self.values.clear()
+
+
+def memoized(key, func, *args):
+    """
+    Returns `func(*args)`, computed once per request for the same `key`. Outside
+    of a request `func` is called every time.
+    """
+
+    memo = current_memo.get()
+    if memo is None:
+        return func(*args)
+    return memo.get(key, func, args)
+
+
+def forget():
+    """Drops what the current request memoized, e.g. after a schema change."""
+
+    memo = current_memo.get()
+    if memo is not None:
+        memo.clear()
+
+
+@contextmanager
+def request_memo():
+    """Memoizes the lookups of the block, counting the duplicates it saved."""
+
+    memo = Memo()
+    token = current_memo.set(memo)
+    try:
+        yield memo
+    finally:
+        current_memo.reset(token)
+        with _totals_lock:
+            _totals["requests"] += 1
+            _totals["lookups"] += memo.lookups
+            _totals["saved"] += memo.saved
+        logger.debug(
+            "Memoized %s lookups, %s of them duplicates", memo.lookups, memo.saved
+        )
+
+
+def stats():
+    with _totals_lock:
+        return dict(_totals)
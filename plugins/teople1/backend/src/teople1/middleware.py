@@ -0,0 +1,160 @@
+import re
+
+from django.conf import settings
+from django.http import JsonResponse
+from django.utils.cache import patch_vary_headers
+
+from .compression import choose_encoding, compress, compress_stream, get_min_length
+from .invalidation import sync
+from .memo import request_memo
+from .routers import reset_reads, use_replica
+from .tenants import TenantNotFound, current_database, resolve_tenant
+
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+
+class TeopleMiddleware:
+    """Base of the middleware that only handles teople1 API requests."""
+
+    path_prefix = "/api/teople1/"
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def applies(self, request):
+        return request.path_info.startswith(self.path_prefix)
+
+
+class CompressionMiddleware(TeopleMiddleware):
+    """
+    Compresses teople1 API responses with Brotli when the client accepts it and
+    gzip otherwise. Regular responses are only compressed above
+    `TEOPLE1_COMPRESS_MIN_LENGTH` bytes and when that makes them smaller,
+    streaming responses are compressed chunk by chunk.
+    """
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if not self.applies(request):
+            return response
+        if response.has_header("Content-Encoding"):
+            return response
+        if not response.streaming and len(response.content) < get_min_length():
+            return response
+
+        patch_vary_headers(response, ("Accept-Encoding",))
+        encoding = choose_encoding(request.META.get("HTTP_ACCEPT_ENCODING", ""))
+        if encoding is None:
+            return response
+
+        if response.streaming:
+            if getattr(response, "is_async", False):
+                return response
+            response.streaming_content = compress_stream(
+                response.streaming_content, encoding
+            )
+            if response.has_header("Content-Length"):
+                del response.headers["Content-Length"]
+        else:
+            content = compress(response.content, encoding)
+            if len(content) >= len(response.content):
+                return response
+            response.content = content
+            response.headers["Content-Length"] = str(len(content))
+
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response.headers["ETag"] = "W/" + etag
+        response.headers["Content-Encoding"] = encoding
+        return response
+
+
+class ReplicaMiddleware(TeopleMiddleware):
+    """
+    Sends the reads of safe teople1 API requests to the read replica. A client
+    that successfully wrote gets a short lived cookie, while it's present its
+    reads stay on the primary so it sees its own writes despite replication lag.
+    """
+
+    cookie_name = "teople1_read_primary"
+
+    def __call__(self, request):
+        if not self.applies(request):
+            return self.get_response(request)
+
+        if request.method in SAFE_METHODS:
+            if self.cookie_name in request.COOKIES:
+                return self.get_response(request)
+            token = use_replica()
+            try:
+                return self.get_response(request)
+            finally:
+                reset_reads(token)
+
+        response = self.get_response(request)
+        if response.status_code < 400:
+            response.set_cookie(
+                self.cookie_name,
+                "1",
+                max_age=getattr(settings, "TEOPLE1_REPLICA_STICKY_SECONDS", 5),
+                httponly=True,
+                samesite="Lax",
+            )
+        return response
+
+
+class TenantMiddleware(TeopleMiddleware):
+    """
+    Resolves the tenant of teople1 API requests and runs the request with its
+    database as the current one. With the "path" resolver the
+    `/api/teople1/t/<slug>/` prefix is removed before the URL is resolved.
+    """
+
+    tenant_path = re.compile(r"^/api/teople1/t/(?P<slug>[\w-]+)/")
+
+    def __call__(self, request):
+        if not self.applies(request):
+            return self.get_response(request)
+
+        slug = None
+        match = self.tenant_path.match(request.path_info)
+        if match:
+            slug = match.group("slug")
+            request.path_info = self.path_prefix + request.path_info[match.end() :]
+
+        try:
+            database_id = resolve_tenant(request, slug)
+        except TenantNotFound as e:
+            return JsonResponse({"status": "error", "message": str(e)}, status=404)
+
+        token = current_database.set(database_id)
+        try:
+            return self.get_response(request)
+        finally:
+            current_database.reset(token)
+
+
+class InvalidationMiddleware(TeopleMiddleware):
+    """
+    Drops the cached schemas, models and display values other workers
+    invalidated before a teople1 API request uses them.
+    """
+
+    def __call__(self, request):
+        if self.applies(request):
+            sync()
+        return self.get_response(request)
+
+
+class MemoMiddleware(TeopleMiddleware):
+    """
+    Memoizes the schema and table lookups of a teople1 API request, so helpers
+    looking up the same table again reuse the first result.
+    """
+
+    def __call__(self, request):
+        if not self.applies(request):
+            return self.get_response(request)
+        with request_memo():
+            return self.get_response(request)
@@ -0,0 +1,38 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="CourseProgress",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("user_id", models.PositiveIntegerField()),
+                ("course_id", models.PositiveIntegerField(db_index=True)),
+                ("completed_count", models.PositiveIntegerField(default=0)),
+                ("total_lessons", models.PositiveIntegerField(default=0)),
+                ("last_activity", models.DateTimeField(null=True)),
+                ("completed", models.BooleanField(default=False)),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name="courseprogress",
+            constraint=models.UniqueConstraint(
+                fields=("user_id", "course_id"),
+                name="teople1_course_progress_user_course",
+            ),
+        ),
+    ]
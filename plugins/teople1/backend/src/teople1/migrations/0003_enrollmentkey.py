@@ -0,0 +1,35 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("teople1", "0002_enrollmentjob"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="EnrollmentKey",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("enrollment_id", models.PositiveIntegerField(db_index=True)),
+                ("user_id", models.PositiveIntegerField()),
+                ("course_id", models.PositiveIntegerField(db_index=True)),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name="enrollmentkey",
+            constraint=models.UniqueConstraint(
+                fields=("user_id", "course_id"),
+                name="teople1_enrollment_key_user_course",
+            ),
+        ),
+    ]
@@ -0,0 +1,79 @@
+from django.db import migrations, models
+
+
+TENANT_MODELS = ["courseprogress", "enrollmentkey", "enrollmentjob", "searchdocument"]
+
+
+def assign_default_database(apps, schema_editor):
+    """Rows written before tenants existed belong to the "Teople" database."""
+
+    models = [apps.get_model("teople1", name) for name in TENANT_MODELS]
+    if not any(model.objects.exists() for model in models):
+        return
+
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT a.id FROM core_application a "
+            "JOIN database_database d ON d.application_ptr_id = a.id "
+            "WHERE a.name = %s ORDER BY a.id LIMIT 1",
+            ["Teople"],
+        )
+        row = cursor.fetchone()
+    for model in models:
+        if row is None:
+            model.objects.all().delete()
+        else:
+            model.objects.update(database_id=row[0])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("teople1", "0004_searchdocument"),
+    ]
+
+    operations = [
+        *[
+            migrations.AddField(
+                model_name=name,
+                name="database_id",
+                field=models.PositiveIntegerField(default=0),
+                preserve_default=False,
+            )
+            for name in TENANT_MODELS
+        ],
+        migrations.RunPython(assign_default_database, migrations.RunPython.noop),
+        migrations.RemoveConstraint(
+            model_name="courseprogress",
+            name="teople1_course_progress_user_course",
+        ),
+        migrations.AddConstraint(
+            model_name="courseprogress",
+            constraint=models.UniqueConstraint(
+                fields=("database_id", "user_id", "course_id"),
+                name="teople1_course_progress_user_course",
+            ),
+        ),
+        migrations.RemoveConstraint(
+            model_name="enrollmentkey",
+            name="teople1_enrollment_key_user_course",
+        ),
+        migrations.AddConstraint(
+            model_name="enrollmentkey",
+            constraint=models.UniqueConstraint(
+                fields=("database_id", "user_id", "course_id"),
+                name="teople1_enrollment_key_user_course",
+            ),
+        ),
+        migrations.RemoveConstraint(
+            model_name="searchdocument",
+            name="teople1_search_document_kind_row",
+        ),
+        migrations.AddConstraint(
+            model_name="searchdocument",
+            constraint=models.UniqueConstraint(
+                fields=("database_id", "kind", "row_id"),
+                name="teople1_search_document_kind_row",
+            ),
+        ),
+    ]
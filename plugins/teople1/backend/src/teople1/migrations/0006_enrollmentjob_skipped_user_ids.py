@@ -0,0 +1,16 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("teople1", "0005_tenant_database"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="enrollmentjob",
+            name="skipped_user_ids",
+            field=models.JSONField(default=list),
+        ),
+    ]
@@ -0,0 +1,157 @@
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
+from django.db import models
+
+
+def current_database_id():
+    # Imported late, the tenants module needs Baserow's models to be loaded.
+    from .tenants import get_current_database_id
+
+    return get_current_database_id()
+
+
+class TenantManager(models.Manager):
+    """
+    Limits queries to the rows of the current tenant and stamps the rows it
+    creates with its database.
+    """
+
+    def get_queryset(self):
+        return super().get_queryset().filter(database_id=current_database_id())
+
+    def create(self, **kwargs):
+        kwargs.setdefault("database_id", current_database_id())
+        return super().create(**kwargs)
+
+    def bulk_create(self, objs, *args, **kwargs):
+        objs = list(objs)
+        database_id = current_database_id() if objs else None
+        for obj in objs:
+            obj.database_id = database_id
+        return super().bulk_create(objs, *args, **kwargs)
+
+
+class CourseProgress(models.Model):
+    """
+    Materialized progress of one user in one course, maintained incrementally
+    when Progress or Lessons rows change. `user_id` and `course_id` are row ids
+    in the Users and Courses tables of the tenant's database `database_id`.
+    """
+
+    database_id = models.PositiveIntegerField()
+    user_id = models.PositiveIntegerField()
+    course_id = models.PositiveIntegerField(db_index=True)
+    completed_count = models.PositiveIntegerField(default=0)
+    total_lessons = models.PositiveIntegerField(default=0)
+    last_activity = models.DateTimeField(null=True)
+    completed = models.BooleanField(default=False)
+
+    objects = TenantManager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["database_id", "user_id", "course_id"],
+                name="teople1_course_progress_user_course",
+            )
+        ]
+
+    @property
+    def percentage(self):
+        if not self.total_lessons:
+            return 0
+        return min(100, self.completed_count * 100 // self.total_lessons)
+
+
+class EnrollmentKey(models.Model):
+    """
+    One `(user id, course id)` pair per Enrollments row, maintained next to the
+    link columns. The unique index makes the duplicate check a single probe and
+    rejects concurrent double enrollments in the database.
+    """
+
+    database_id = models.PositiveIntegerField()
+    enrollment_id = models.PositiveIntegerField(db_index=True)
+    user_id = models.PositiveIntegerField()
+    course_id = models.PositiveIntegerField(db_index=True)
+
+    objects = TenantManager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["database_id", "user_id", "course_id"],
+                name="teople1_enrollment_key_user_course",
+            )
+        ]
+
+
+class EnrollmentJob(models.Model):
+    """
+    A queued bulk enrollment of `user_ids` into one course. The worker updates
+    the counters after every batch so the job can be polled while it runs.
+    """
+
+    PENDING = "pending"
+    RUNNING = "running"
+    FINISHED = "finished"
+    FAILED = "failed"
+    STATES = [
+        (PENDING, "Pending"),
+        (RUNNING, "Running"),
+        (FINISHED, "Finished"),
+        (FAILED, "Failed"),
+    ]
+
+    database_id = models.PositiveIntegerField()
+    course_id = models.PositiveIntegerField()
+    user_ids = models.JSONField(default=list)
+    state = models.CharField(max_length=16, choices=STATES, default=PENDING)
+    processed_count = models.PositiveIntegerField(default=0)
+    enrolled_count = models.PositiveIntegerField(default=0)
+    skipped_count = models.PositiveIntegerField(default=0)
+    # Users that were already enrolled, in the order they were processed.
+    skipped_user_ids = models.JSONField(default=list)
+    progress_count = models.PositiveIntegerField(default=0)
+    error = models.TextField(blank=True, default="")
+    created_on = models.DateTimeField(auto_now_add=True)
+    updated_on = models.DateTimeField(auto_now=True)
+
+    objects = TenantManager()
+
+    @property
+    def percentage(self):
+        if not self.user_ids:
+            return 100
+        return self.processed_count * 100 // len(self.user_ids)
+
+
+class SearchDocument(models.Model):
+    """
+    Searchable text of one Courses or Lessons row. `vector` is precomputed from
+    the title (weight A) and body (weight B) whenever the row is written.
+    """
+
+    COURSE = "course"
+    LESSON = "lesson"
+    KINDS = [(COURSE, "Course"), (LESSON, "Lesson")]
+
+    database_id = models.PositiveIntegerField()
+    kind = models.CharField(max_length=16, choices=KINDS)
+    row_id = models.PositiveIntegerField()
+    title = models.TextField(blank=True, default="")
+    body = models.TextField(blank=True, default="")
+    vector = SearchVectorField(null=True)
+
+    objects = TenantManager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["database_id", "kind", "row_id"],
+                name="teople1_search_document_kind_row",
+            )
+        ]
+        indexes = [
+            GinIndex(fields=["vector"], name="teople1_search_vector"),
+        ]
@@ -2,8 +2,6 @@ from loguru import logger
 from baserow.core.registries import Plugin
 from django.urls import path, include
 
-from .api import urls as api_urls
-
 
 class PluginNamePlugin(Plugin):
     type = "teople1"
@@ -12,6 +10,6 @@ class PluginNamePlugin(Plugin):
         return [
             path(
                 "teople1/",
-                include(api_urls, namespace=self.type),
+                include("teople1.api.urls", namespace=self.type),
             ),
         ]
@@ -0,0 +1,203 @@
+import logging
+
+from django.db import transaction
+
+from .api.schema import SchemaError, get_relation_field_id, get_table_schema
+from .models import CourseProgress
+
+
+logger = logging.getLogger(__name__)
+
+REBUILD_CHUNK_SIZE = 500
+
+
+def get_progress_columns():
+    """
+    Returns the Progress schema and its user, course, lesson and completed columns.
+    Without a Progress table there is nothing to maintain and all are None.
+    """
+
+    try:
+        schema = get_table_schema("Progress")
+    except SchemaError:
+        return None, None, None, None, None
+    return (
+        schema,
+        get_relation_field_id("Progress", "Users", prefer="user"),
+        get_relation_field_id("Progress", "Courses", prefer="course"),
+        get_relation_field_id("Progress", "Lessons", prefer="lesson"),
+        schema.column("completed"),
+    )
+
+
+def get_lessons_columns():
+    try:
+        schema = get_table_schema("Lessons")
+    except SchemaError:
+        return None, None
+    return schema, get_relation_field_id("Lessons", "Courses", prefer="course")
+
+
+def get_course_lessons(course_ids):
+    """Returns `course id -> set of lesson ids` with one query."""
+
+    lessons = {course_id: set() for course_id in course_ids}
+    schema, column = get_lessons_columns()
+    if column is None or not course_ids:
+        return lessons
+
+    pairs = schema.model.objects.filter(**{f"{column}__in": course_ids}).values_list(
+        column, "id"
+    )
+    for course_id, lesson_id in pairs:
+        if course_id in lessons:
+            lessons[course_id].add(lesson_id)
+    return lessons
+
+
+def get_progress_pairs(progress_ids):
+    """Returns the `(user id, course id)` pairs the given Progress rows belong to."""
+
+    schema, user, course, _, _ = get_progress_columns()
+    if not user or not course:
+        return set()
+    return {
+        pair
+        for pair in schema.model.objects.filter(id__in=list(progress_ids)).values_list(
+            user, course
+        )
+        if None not in pair
+    }
+
+
+def get_lesson_courses(lesson_ids):
+    """Returns the ids of the courses the given Lessons rows are linked to."""
+
+    schema, column = get_lessons_columns()
+    if column is None:
+        return set()
+    return {
+        course_id
+        for course_id in schema.model.objects.filter(
+            id__in=list(lesson_ids)
+        ).values_list(column, flat=True)
+        if course_id is not None
+    }
+
+
+def refresh_pairs(pairs):
+    """
+    Recomputes the counters of the given `(user id, course id)` pairs from the
+    Progress and Lessons tables with one query each and writes them with one
+    upsert. Pairs without any progress left are removed.
+    """
+
+    pairs = set(pairs)
+    if not pairs:
+        return
+
+    schema, user, course, lesson, completed = get_progress_columns()
+    if not user or not course:
+        return
+
+    user_ids = {user_id for user_id, _ in pairs}
+    course_ids = {course_id for _, course_id in pairs}
+    course_lessons = get_course_lessons(course_ids)
+
+    fields = [user, course, lesson or "id", completed or "id", "updated_on"]
+    rows = schema.model.objects.filter(
+        **{f"{user}__in": user_ids, f"{course}__in": course_ids}
+    ).values_list(*fields)
+
+    done = {pair: set() for pair in pairs}
+    activity = {}
+    for user_id, course_id, lesson_id, is_completed, updated_on in rows:
+        pair = (user_id, course_id)
+        if pair not in done:
+            continue
+        if pair not in activity or updated_on > activity[pair]:
+            activity[pair] = updated_on
+        if not lesson or (completed and not is_completed):
+            continue
+        if lesson_id in course_lessons[course_id]:
+            done[pair].add(lesson_id)
+
+    objs = []
+    for (user_id, course_id), lesson_ids in done.items():
+        if (user_id, course_id) not in activity:
+            continue
+        total = len(course_lessons[course_id])
+        objs.append(
+            CourseProgress(
+                user_id=user_id,
+                course_id=course_id,
+                completed_count=len(lesson_ids),
+                total_lessons=total,
+                last_activity=activity[(user_id, course_id)],
+                completed=total > 0 and len(lesson_ids) >= total,
+            )
+        )
+
+    stale = pairs - set(activity)
+    with transaction.atomic():
+        for user_id, course_id in stale:
+            CourseProgress.objects.filter(user_id=user_id, course_id=course_id).delete()
+        CourseProgress.objects.bulk_create(
+            objs,
+            update_conflicts=True,
+            unique_fields=["database_id", "user_id", "course_id"],
+            update_fields=[
+                "completed_count",
+                "total_lessons",
+                "last_activity",
+                "completed",
+            ],
+        )
+
+
+def refresh_courses(course_ids):
+    """Recomputes every user's counters of the given courses."""
+
+    course_ids = set(course_ids)
+    if not course_ids:
+        return
+
+    pairs = set(
+        CourseProgress.objects.filter(course_id__in=course_ids).values_list(
+            "user_id", "course_id"
+        )
+    )
+    schema, user, course, _, _ = get_progress_columns()
+    if user and course:
+        pairs.update(
+            pair
+            for pair in schema.model.objects.filter(
+                **{f"{course}__in": course_ids}
+            ).values_list(user, course)
+            if None not in pair and pair[1] in course_ids
+        )
+    refresh_pairs(pairs)
+
+
+def forget_courses(course_ids):
+    CourseProgress.objects.filter(course_id__in=list(course_ids)).delete()
+
+
+def rebuild_course_progress():
+    """Rebuilds the whole materialized table from the Progress table."""
+
+    schema, user, course, _, _ = get_progress_columns()
+    pairs = set()
+    if user and course:
+        pairs = {
+            pair
+            for pair in schema.model.objects.values_list(user, course)
+            if None not in pair
+        }
+
+    with transaction.atomic():
+        CourseProgress.objects.all().delete()
+        pairs = sorted(pairs, key=lambda pair: pair[1])
+        for start in range(0, len(pairs), REBUILD_CHUNK_SIZE):
+            refresh_pairs(pairs[start : start + REBUILD_CHUNK_SIZE])
+    return len(pairs)
@@ -0,0 +1,123 @@
+import logging
+from collections import defaultdict
+
+from baserow.ws.registries import PageType
+from baserow.ws.tasks import broadcast_to_channel_group
+from django.core import signing
+from django.db import transaction
+
+from .api.links import load_links
+from .api.schema import SchemaError, get_relation_field_id, get_table_schema
+from .tenants import get_current_database_id
+
+
+logger = logging.getLogger(__name__)
+
+TOKEN_SALT = "teople1.realtime"
+# Same lifetime as the login session.
+TOKEN_MAX_AGE = 86400
+
+
+def make_token(user_id):
+    """
+    Signed token proving a websocket subscriber is the user `user_id` of the
+    current tenant.
+    """
+
+    return signing.dumps([get_current_database_id(), user_id], salt=TOKEN_SALT)
+
+
+def read_token(token):
+    """Returns the `(database id, user id)` of a valid token, None otherwise."""
+
+    try:
+        database_id, user_id = signing.loads(
+            token, salt=TOKEN_SALT, max_age=TOKEN_MAX_AGE
+        )
+    except (signing.BadSignature, TypeError, ValueError):
+        return None
+    return database_id, user_id
+
+
+def get_group_name(database_id, user_id, course_id):
+    return f"teople1-{database_id}-user-{user_id}-course-{course_id}"
+
+
+class CoursePageType(PageType):
+    """
+    The websocket page of a course, subscribed to by sending
+    `{"page": "teople1_course", "course_id": id, "token": token}` with the token
+    returned by the login endpoint. Subscribers receive `teople1_rows_changed`
+    events for their own enrollments and progress of that course.
+    """
+
+    type = "teople1_course"
+    parameters = ["course_id", "token"]
+
+    def can_add(self, user, web_socket_id, course_id, token, **kwargs):
+        return isinstance(course_id, int) and read_token(token) is not None
+
+    def get_group_name(self, course_id, token, **kwargs):
+        return get_group_name(*read_token(token), course_id)
+
+
+def get_row_owners(table_name, ids):
+    """Returns `row id -> {(user id, course id)}` for rows of `table_name`."""
+
+    owners = defaultdict(set)
+    if not ids:
+        return owners
+    try:
+        schema = get_table_schema(table_name)
+    except SchemaError:
+        return owners
+    user = get_relation_field_id(table_name, "Users", prefer="user")
+    course = get_relation_field_id(table_name, "Courses", prefer="course")
+    if not user or not course:
+        return owners
+
+    pairs = schema.model.objects.filter(id__in=ids).values_list("id", user, course)
+    for row_id, user_id, course_id in pairs:
+        if user_id and course_id:
+            owners[row_id].add((user_id, course_id))
+    return owners
+
+
+def publish_changes(table_name, ids, previous=None):
+    """
+    Pushes the rows `ids` to the groups of their users and courses once the
+    transaction commits. `previous` are the owners from before the write, groups
+    a row was deleted from or moved out of receive its id in `deleted`.
+    """
+
+    ids = list(ids)
+    previous = previous or {}
+    transaction.on_commit(lambda: broadcast_changes(table_name, ids, previous))
+
+
+def broadcast_changes(table_name, ids, previous):
+    try:
+        schema = get_table_schema(table_name)
+        rows = list(schema.enhance(schema.model.objects.filter(id__in=ids)))
+        data = schema.serialize_many(rows, load_links(schema, rows))
+        owners = get_row_owners(table_name, [row.id for row in rows])
+    except Exception:
+        logger.exception("Couldn't load the changed %s rows", table_name)
+        return
+
+    changes = defaultdict(lambda: {"rows": [], "deleted": []})
+    current = {row.id: values for row, values in zip(rows, data)}
+    for row_id in ids:
+        now = owners.get(row_id, set())
+        for pair in now:
+            changes[pair]["rows"].append(current[row_id])
+        for pair in previous.get(row_id, set()) - now:
+            changes[pair]["deleted"].append(row_id)
+
+    database_id = get_current_database_id()
+    for (user_id, course_id), payload in changes.items():
+        broadcast_to_channel_group.delay(
+            get_group_name(database_id, user_id, course_id),
+            {"type": "teople1_rows_changed", "table": table_name, **payload},
+            None,
+        )
@@ -0,0 +1,50 @@
+from contextvars import ContextVar
+
+from django.conf import settings
+
+
+# The alias reads go to in the current request, None means the default database.
+read_alias = ContextVar("teople1_read_alias", default=None)
+
+
+def get_replica_alias():
+    return getattr(settings, "TEOPLE1_REPLICA_ALIAS", "replica")
+
+
+def use_replica():
+    """Sends the reads of the current context to the replica, returns a token."""
+
+    return read_alias.set(get_replica_alias())
+
+
+def reset_reads(token):
+    read_alias.reset(token)
+
+
+def pin_primary():
+    """
+    Sends the remaining reads of the current context to the primary, e.g. after
+    a GET request had to write something it reads back.
+    """
+
+    read_alias.set(None)
+
+
+class ReplicaRouter:
+    """
+    Routes reads to the replica while `use_replica` is active, which the
+    `ReplicaMiddleware` does for safe teople1 API requests. Everything else uses
+    the default database.
+    """
+
+    def db_for_read(self, model, **hints):
+        return read_alias.get()
+
+    def db_for_write(self, model, **hints):
+        return None
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return False if db == get_replica_alias() else None
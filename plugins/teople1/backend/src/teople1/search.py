@@ -0,0 +1,137 @@
+from django.contrib.postgres.search import (
+    SearchHeadline,
+    SearchQuery,
+    SearchRank,
+    SearchVector,
+)
+from django.db import transaction
+from django.db.models import F
+
+from .api.schema import SchemaError, get_table_schema
+from .models import SearchDocument
+
+
+SEARCH_CONFIG = "english"
+INDEX_CHUNK_SIZE = 500
+
+# Searchable kinds mapped to `(table, title field, body fields)`. A missing title
+# field falls back to the primary field, missing body fields are skipped.
+SEARCH_SOURCES = {
+    SearchDocument.COURSE: ("Courses", "title", ("description",)),
+    SearchDocument.LESSON: ("Lessons", "title", ("content", "description")),
+}
+
+DOCUMENT_VECTOR = SearchVector(
+    "title", weight="A", config=SEARCH_CONFIG
+) + SearchVector("body", weight="B", config=SEARCH_CONFIG)
+
+
+def get_source_columns(kind):
+    """Returns the schema, title column and body columns of a searchable kind."""
+
+    table_name, title, body = SEARCH_SOURCES[kind]
+    try:
+        schema = get_table_schema(table_name)
+    except SchemaError:
+        return None, None, []
+
+    title_column = schema.column(title) or next(
+        (fo["name"] for fo in schema.field_objects if fo["field"].primary), None
+    )
+    body_columns = [schema.column(name) for name in body if schema.column(name)]
+    return schema, title_column, body_columns
+
+
+def to_text(value):
+    return "" if value is None else str(value)
+
+
+def index_rows(kind, row_ids):
+    """
+    Upserts the documents of the given rows with one INSERT and recomputes their
+    vectors with one UPDATE. Rows that no longer exist lose their document.
+    """
+
+    row_ids = set(row_ids)
+    schema, title, body = get_source_columns(kind)
+    if not row_ids or schema is None:
+        return
+
+    columns = [title or "id", *body]
+    docs = [
+        SearchDocument(
+            kind=kind,
+            row_id=row[0],
+            title=to_text(row[1]) if title else "",
+            body=" ".join(to_text(value) for value in row[2:] if value),
+        )
+        for row in schema.model.objects.filter(id__in=row_ids).values_list(
+            "id", *columns
+        )
+    ]
+    found = {doc.row_id for doc in docs}
+
+    with transaction.atomic():
+        forget_rows(kind, row_ids - found)
+        SearchDocument.objects.bulk_create(
+            docs,
+            update_conflicts=True,
+            unique_fields=["database_id", "kind", "row_id"],
+            update_fields=["title", "body"],
+        )
+        SearchDocument.objects.filter(kind=kind, row_id__in=found).update(
+            vector=DOCUMENT_VECTOR
+        )
+
+
+def forget_rows(kind, row_ids):
+    SearchDocument.objects.filter(kind=kind, row_id__in=list(row_ids)).delete()
+
+
+def rebuild_search_index():
+    """Rebuilds all documents from the Courses and Lessons tables."""
+
+    count = 0
+    with transaction.atomic():
+        SearchDocument.objects.all().delete()
+        for kind in SEARCH_SOURCES:
+            schema, _, _ = get_source_columns(kind)
+            if schema is None:
+                continue
+            ids = list(schema.model.objects.order_by("id").values_list("id", flat=True))
+            for start in range(0, len(ids), INDEX_CHUNK_SIZE):
+                index_rows(kind, ids[start : start + INDEX_CHUNK_SIZE])
+            count += len(ids)
+    return count
+
+
+def search(query, kinds=None, offset=0, limit=20):
+    """
+    Returns `(count, hits)` for a web search style `query`. Hits are ordered by
+    rank and annotated with `rank` and a `snippet` of the body with the matches
+    wrapped in `<mark>`.
+    """
+
+    search_query = SearchQuery(query, search_type="websearch", config=SEARCH_CONFIG)
+    queryset = SearchDocument.objects.filter(vector=search_query)
+    if kinds:
+        queryset = queryset.filter(kind__in=kinds)
+
+    hits = (
+        queryset.annotate(
+            rank=SearchRank(F("vector"), search_query),
+            snippet=SearchHeadline(
+                "body",
+                search_query,
+                config=SEARCH_CONFIG,
+                start_sel="<mark>",
+                stop_sel="</mark>",
+                max_words=35,
+                min_words=15,
+                max_fragments=2,
+            ),
+        )
+        .order_by("-rank", "id")
+        .defer("body", "vector")
+    )
+    return queryset.count(), list(hits[offset : offset + limit])
@@ -0,0 +1,165 @@
+from baserow.contrib.database.fields.signals import (
+    field_created,
+    field_deleted,
+    field_restored,
+    field_updated,
+)
+from baserow.contrib.database.rows.signals import (
+    before_rows_delete,
+    before_rows_update,
+    rows_created,
+    rows_deleted,
+    rows_updated,
+)
+from baserow.contrib.database.table.signals import table_deleted, table_updated
+from django.dispatch import receiver
+
+from .api.schema import SchemaError
+from .enrollment import forget_enrollments, track_enrollments
+from .invalidation import is_tenant_table, publish_rows, publish_schema
+from .progress import (
+    get_lesson_courses,
+    get_lessons_columns,
+    get_progress_pairs,
+    refresh_courses,
+    refresh_pairs,
+)
+from .search import SEARCH_SOURCES, forget_rows, index_rows
+from .tenants import use_database
+
+
+@receiver(field_created)
+@receiver(field_updated)
+@receiver(field_deleted)
+@receiver(field_restored)
+def publish_field_change(sender, field, related_fields=None, **kwargs):
+    """
+    A field change affects the schema of the field's table and of the tables of
+    related fields, like a link's reverse field.
+    """
+
+    tables = [field.table, *(related.table for related in related_fields or ())]
+    publish_schema({table.id for table in tables if is_tenant_table(table)})
+
+
+@receiver(table_updated)
+@receiver(table_deleted)
+def publish_table_change(sender, table, **kwargs):
+    if is_tenant_table(table):
+        publish_schema([table.id])
+
+
+@receiver(rows_updated)
+@receiver(rows_deleted)
+def publish_rows_change(sender, rows, table, **kwargs):
+    if is_tenant_table(table):
+        publish_rows(table.id, [row.id for row in rows])
+
+
+def is_teople_table(table, *names):
+    """Whether `table` is one of the teople1 tables `names` of a tenant database."""
+
+    return table.name in names and is_tenant_table(table)
+
+
+@receiver(rows_created)
+@receiver(rows_updated)
+def track_enrollment_rows(sender, rows, table, **kwargs):
+    """Keeps the enrollment keys of rows changed in Baserow up to date."""
+
+    if not is_teople_table(table, "Enrollments"):
+        return
+    with use_database(table.database_id):
+        try:
+            track_enrollments([row.id for row in rows])
+        except SchemaError:
+            pass
+
+
+@receiver(rows_deleted)
+def forget_enrollment_rows(sender, rows, table, **kwargs):
+    if is_teople_table(table, "Enrollments"):
+        with use_database(table.database_id):
+            forget_enrollments([row.id for row in rows])
+
+
+def get_search_kind(table):
+    for kind, (table_name, _, _) in SEARCH_SOURCES.items():
+        if is_teople_table(table, table_name):
+            return kind
+    return None
+
+
+@receiver(rows_created)
+@receiver(rows_updated)
+def index_search_rows(sender, rows, table, **kwargs):
+    """Re-indexes Courses and Lessons rows written in Baserow."""
+
+    kind = get_search_kind(table)
+    if kind is not None:
+        with use_database(table.database_id):
+            index_rows(kind, [row.id for row in rows])
+
+
+@receiver(rows_deleted)
+def forget_search_rows(sender, rows, table, **kwargs):
+    kind = get_search_kind(table)
+    if kind is not None:
+        with use_database(table.database_id):
+            forget_rows(kind, [row.id for row in rows])
+
+
+def changes_progress(table, updated_field_ids=None):
+    """
+    Whether writing rows of `table` changes the course progress counters: any
+    Progress write and, for Lessons, all but updates leaving the course alone.
+    """
+
+    if not is_teople_table(table, "Progress", "Lessons"):
+        return False
+    if table.name == "Progress" or updated_field_ids is None:
+        return True
+    with use_database(table.database_id):
+        _, course = get_lessons_columns()
+    return course in {f"field_{field_id}" for field_id in updated_field_ids}
+
+
+def get_progress_owners(table, ids):
+    """The `(user id, course id)` pairs of Progress or the courses of Lessons rows."""
+
+    if table.name == "Progress":
+        return get_progress_pairs(ids)
+    return get_lesson_courses(ids)
+
+
+@receiver(before_rows_update)
+@receiver(before_rows_delete)
+def collect_progress_owners(sender, rows, table, updated_field_ids=None, **kwargs):
+    """Passes the owners from before the write on to `refresh_progress_rows`."""
+
+    if changes_progress(table, updated_field_ids):
+        with use_database(table.database_id):
+            return get_progress_owners(table, [row.id for row in rows])
+
+
+@receiver(rows_created)
+@receiver(rows_updated)
+@receiver(rows_deleted)
+def refresh_progress_rows(
+    sender, rows, table, before_return=None, updated_field_ids=None, **kwargs
+):
+    """
+    Recomputes the counters of the users and courses of Progress and Lessons rows
+    written in Baserow, before and after the write so deleted and moved rows
+    are covered too.
+    """
+
+    if not changes_progress(table, updated_field_ids):
+        return
+    previous = dict(before_return or ()).get(collect_progress_owners) or set()
+    with use_database(table.database_id):
+        owners = get_progress_owners(table, [row.id for row in rows]) | previous
+        if table.name == "Progress":
+            refresh_pairs(owners)
+        else:
+            refresh_courses(owners)
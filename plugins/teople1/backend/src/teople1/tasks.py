@@ -0,0 +1,12 @@
+from baserow.config.celery import app
+
+
+@app.task(bind=True, queue="export")
+def run_enrollment_job(self, job_id, database_id=None):
+    from .enrollment import run_enrollment_job
+    from .invalidation import sync
+    from .tenants import get_current_database_id, use_database
+
+    sync()
+    with use_database(database_id or get_current_database_id()):
+        run_enrollment_job(job_id)
@@ -0,0 +1,111 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from baserow.contrib.database.models import Database
+from django.conf import settings
+
+from .api.cache import LRUCache
+
+
+DEFAULT_DATABASE_NAME = "Teople"
+TENANT_CACHE_SIZE = 1024
+
+# Id of the Baserow database of the tenant the current request belongs to. None
+# outside of requests, where the default tenant is used.
+current_database = ContextVar("teople1_database", default=None)
+
+# `database name -> database id` of the default tenant, so requests don't look up
+# their database by name.
+_database_ids = LRUCache(TENANT_CACHE_SIZE)
+
+
+class TenantNotFound(Exception):
+    pass
+
+
+def get_default_name():
+    return getattr(settings, "TEOPLE1_DATABASE_NAME", DEFAULT_DATABASE_NAME)
+
+
+def get_database_id(name):
+    """Returns the id of the database named `name`."""
+
+    cached = _database_ids.get(name)
+    if cached is not None:
+        return cached
+
+    database_id = (
+        Database.objects.filter(name=name).order_by("id").values_list("id", flat=True)
+    ).first()
+    if database_id is None:
+        raise TenantNotFound(
+            f"Database '{name}' not found. Please create it in Baserow first."
+        )
+    _database_ids.set(name, database_id)
+    return database_id
+
+
+def get_current_database_id():
+    database_id = current_database.get()
+    if database_id is None:
+        database_id = get_database_id(get_default_name())
+    return database_id
+
+
+def get_tenant_database_ids():
+    """Ids of the databases the teople1 API serves: the mapped and the default."""
+
+    database_ids = {
+        int(database_id)
+        for setting in ("TEOPLE1_TENANT_HOSTS", "TEOPLE1_TENANT_SLUGS")
+        for database_id in getattr(settings, setting, {}).values()
+    }
+    try:
+        database_ids.add(get_database_id(get_default_name()))
+    except TenantNotFound:
+        pass
+    return database_ids
+
+
+@contextmanager
+def use_database(database_id):
+    """Runs the block as the tenant of `database_id`, e.g. in a Celery task."""
+
+    token = current_database.set(database_id)
+    try:
+        yield
+    finally:
+        current_database.reset(token)
+
+
+def forget_databases():
+    _database_ids.clear()
+
+
+def resolve_tenant(request, slug=None):
+    """
+    Returns the id of the database `request` belongs to, depending on
+    `TEOPLE1_TENANT_RESOLVER`:
+
+    - "host": the database mapped to the request's host in `TEOPLE1_TENANT_HOSTS`.
+    - "path": the database mapped to the `/api/teople1/t/<slug>/` prefix in
+      `TEOPLE1_TENANT_SLUGS`, the default database without the prefix.
+    - otherwise the default database.
+
+    Only mapped databases are served, anything else raises `TenantNotFound`.
+    """
+
+    resolver = getattr(settings, "TEOPLE1_TENANT_RESOLVER", "")
+    if resolver == "host":
+        host = request.get_host().split(":")[0]
+        return get_mapped_database_id("TEOPLE1_TENANT_HOSTS", host)
+    if resolver == "path" and slug is not None:
+        return get_mapped_database_id("TEOPLE1_TENANT_SLUGS", slug)
+    return get_database_id(get_default_name())
+
+
+def get_mapped_database_id(setting, key):
+    database_id = getattr(settings, setting, {}).get(key)
+    if database_id is None:
+        raise TenantNotFound(f"Tenant '{key}' not found.")
+    return int(database_id)
@@ -0,0 +1,58 @@
+import logging
+import threading
+
+from django.db import connection
+
+
+logger = logging.getLogger(__name__)
+
+
+def get_api_tables():
+    """Names of the tables behind the `TableResource` views."""
+
+    from .api import views
+    from .api.resources import TableResource
+
+    return sorted(
+        {
+            view.table_name
+            for view in vars(views).values()
+            if isinstance(view, type)
+            and issubclass(view, TableResource)
+            and view.table_name
+        }
+    )
+
+
+def warm_up():
+    """
+    Builds the schemas of the API tables up front: their generated models,
+    serializers, write plans and link targets. Returns the tables that exist.
+    """
+
+    from .api.schema import SchemaError, get_table_schema
+
+    warmed = []
+    for table_name in get_api_tables():
+        try:
+            schema = get_table_schema(table_name)
+        except SchemaError:
+            continue
+        schema.write_plan
+        schema.link_targets
+        warmed.append(table_name)
+    return warmed
+
+
+def start_warm_up():
+    """Runs `warm_up` in a daemon thread so it doesn't delay the worker's boot."""
+
+    def run():
+        try:
+            logger.info("Warmed up the teople1 tables %s", warm_up())
+        except Exception:
+            logger.exception("Warming up the teople1 tables failed")
+        finally:
+            connection.close()
+
+    threading.Thread(target=run, name="teople1-warm-up", daemon=True).start()
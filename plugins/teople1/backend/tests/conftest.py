@@ -1,5 +1,103 @@
 from __future__ import print_function
 
+import pytest
+from baserow.contrib.database.rows.signals import (
+    before_rows_delete,
+    before_rows_update,
+    rows_created,
+    rows_deleted,
+    rows_updated,
+)
 
 # noinspection PyUnresolvedReferences
 from baserow.test_utils.pytest_conftest import *  # noqa: F403, F401
+
+
+class TeopleFixture:
+    """Creates the "Teople" database with tables, fields and rows for the tests."""
+
+    def __init__(self, data_fixture):
+        self.data_fixture = data_fixture
+        self.database = data_fixture.create_database_application(name="Teople")
+
+    def create_table(self, name, primary="name", **fields):
+        table = self.data_fixture.create_database_table(
+            database=self.database, name=name
+        )
+        self.data_fixture.create_text_field(table=table, name=primary, primary=True)
+        for field_name, field_type in fields.items():
+            getattr(self.data_fixture, f"create_{field_type}_field")(
+                table=table, name=field_name
+            )
+        return table
+
+    def create_link(self, table, target, name):
+        return self.data_fixture.create_link_row_field(
+            table=table, link_row_table=target, name=name
+        )
+
+    def create_row(self, table, **values):
+        model = table.get_model()
+        columns = {fo["field"].name: fo["name"] for fo in model.get_field_objects()}
+        links = {k: v for k, v in values.items() if isinstance(v, list)}
+        row = model.objects.create(
+            **{columns[k]: v for k, v in values.items() if k not in links}
+        )
+        for name, ids in links.items():
+            getattr(row, columns[name]).set(ids)
+        return row
+
+    def baserow_create_row(self, table, **values):
+        """Creates a row and sends the signals like a row created in Baserow."""
+
+        row = self.create_row(table, **values)
+        rows_created.send(
+            None, rows=[row], before=None, user=None, table=table, model=type(row)
+        )
+        return row
+
+    def baserow_update_row(self, table, row, **values):
+        """Updates `row` and sends the signals like a row edited in Baserow."""
+
+        model = type(row)
+        fields = {fo["field"].name: fo["field"] for fo in model.get_field_objects()}
+        updated_field_ids = {fields[name].id for name in values}
+        signal_kwargs = dict(
+            rows=[row],
+            user=None,
+            table=table,
+            model=model,
+            updated_field_ids=updated_field_ids,
+        )
+        before = before_rows_update.send(None, **signal_kwargs)
+        for name, value in values.items():
+            if isinstance(value, list):
+                getattr(row, f"field_{fields[name].id}").set(value)
+            else:
+                setattr(row, f"field_{fields[name].id}", value)
+        row.save()
+        rows_updated.send(None, before_return=before, **signal_kwargs)
+        return row
+
+    def baserow_delete_row(self, table, row):
+        """Deletes `row` and sends the signals like a row deleted in Baserow."""
+
+        model = type(row)
+        signal_kwargs = dict(rows=[row], user=None, table=table, model=model)
+        before = before_rows_delete.send(None, **signal_kwargs)
+        row.delete()
+        rows_deleted.send(None, before_return=before, **signal_kwargs)
+
+
+@pytest.fixture
+def teople(data_fixture):
+    return TeopleFixture(data_fixture)
+
+
+@pytest.fixture(autouse=True)
+def clear_teople_schema_cache():
+    from teople1.api.schema import invalidate_schema
+
+    invalidate_schema()
+    yield
+    invalidate_schema()
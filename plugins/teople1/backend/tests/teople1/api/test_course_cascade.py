@@ -0,0 +1,81 @@
+import pytest
+from django.shortcuts import reverse
+from rest_framework.status import HTTP_200_OK, HTTP_201_CREATED, HTTP_404_NOT_FOUND
+
+
+@pytest.fixture
+def course_graph(teople):
+    courses = teople.create_table("Courses", primary="title")
+    lessons = teople.create_table("Lessons", primary="title")
+    quiz = teople.create_table("Quiz", primary="title")
+    questions = teople.create_table("Questions", primary="question_text")
+    users = teople.create_table("Users", primary="username")
+    progress = teople.create_table("Progress", primary="name")
+    teople.create_link(lessons, courses, "course")
+    teople.create_link(quiz, courses, "course")
+    teople.create_link(questions, quiz, "quiz")
+    teople.create_link(progress, courses, "course")
+    teople.create_link(progress, users, "user")
+
+    course = teople.create_row(courses, title="Python")
+    other = teople.create_row(courses, title="Shared")
+    teople.create_row(lessons, title="Intro", course=[course.id])
+    teople.create_row(lessons, title="Shared lesson", course=[course.id, other.id])
+    a_quiz = teople.create_row(quiz, title="Final", course=[course.id])
+    teople.create_row(questions, question_text="Q1", quiz=[a_quiz.id])
+    teople.create_row(questions, question_text="Q2", quiz=[a_quiz.id])
+    user = teople.create_row(users, username="ada")
+    teople.create_row(progress, name="p", course=[course.id], user=[user.id])
+    return course, other
+
+
+@pytest.mark.django_db
+def test_clone_course(api_client, course_graph):
+    course, _ = course_graph
+
+    response = api_client.post(
+        reverse("api:teople1:course_clone", kwargs={"row_id": course.id}),
+        {"title": "Python (next term)"},
+        format="json",
+    )
+    assert response.status_code == HTTP_201_CREATED
+    body = response.json()
+    assert body["course"]["title"] == "Python (next term)"
+    assert body["copied"] == {"Courses": 1, "Lessons": 2, "Quiz": 1, "Questions": 2}
+
+    new_id = body["course"]["id"]
+    lessons = api_client.get(
+        reverse("api:teople1:lessons"), {"course_id": new_id}
+    ).json()["lessons"]
+    assert sorted(lesson["title"] for lesson in lessons) == ["Intro", "Shared lesson"]
+    assert all(lesson["course"] == [new_id] for lesson in lessons)
+
+    quizzes = api_client.get(
+        reverse("api:teople1:quizzes"), {"course_id": new_id}
+    ).json()["quizzes"]
+    questions = api_client.get(
+        reverse("api:teople1:questions"), {"quiz_id": quizzes[0]["id"]}
+    ).json()
+    assert questions["count"] == 2
+
+
+@pytest.mark.django_db
+def test_cascade_delete_course(api_client, course_graph):
+    course, other = course_graph
+    url = reverse("api:teople1:course_cascade_delete", kwargs={"row_id": course.id})
+
+    response = api_client.delete(url)
+    assert response.status_code == HTTP_200_OK
+    assert response.json()["deleted"] == {
+        "Progress": 1,
+        "Questions": 2,
+        "Quiz": 1,
+        "Lessons": 1,
+        "Courses": 1,
+    }
+
+    lessons = api_client.get(reverse("api:teople1:lessons")).json()["lessons"]
+    assert [lesson["title"] for lesson in lessons] == ["Shared lesson"]
+    assert lessons[0]["course"] == [other.id]
+
+    assert api_client.delete(url).status_code == HTTP_404_NOT_FOUND
@@ -0,0 +1,34 @@
+import pytest
+from django.shortcuts import reverse
+from rest_framework.status import HTTP_200_OK, HTTP_400_BAD_REQUEST, HTTP_404_NOT_FOUND
+
+
+# The overview reads on pool threads with their own connections, so the rows must
+# be committed.
+@pytest.mark.django_db(transaction=True)
+def test_course_overview(api_client, teople):
+    courses = teople.create_table("Courses", primary="title")
+    lessons = teople.create_table("Lessons", primary="title")
+    quiz = teople.create_table("Quiz", primary="title")
+    teople.create_link(lessons, courses, "course")
+    teople.create_link(quiz, courses, "course")
+
+    course = teople.create_row(courses, title="Python")
+    other = teople.create_row(courses, title="Go")
+    teople.create_row(lessons, title="Intro", course=[course.id])
+    teople.create_row(lessons, title="Channels", course=[other.id])
+    teople.create_row(quiz, title="Final", course=[course.id])
+
+    url = reverse("api:teople1:course_overview", kwargs={"row_id": course.id})
+    response = api_client.get(url)
+    assert response.status_code == HTTP_200_OK
+    body = response.json()
+    assert body["course"]["title"] == "Python"
+    assert [lesson["title"] for lesson in body["lessons"]] == ["Intro"]
+    assert [quiz["title"] for quiz in body["quizzes"]] == ["Final"]
+    assert "progress" not in body
+
+    assert api_client.get(url, {"user_id": "x"}).status_code == HTTP_400_BAD_REQUEST
+
+    missing = reverse("api:teople1:course_overview", kwargs={"row_id": 999999})
+    assert api_client.get(missing).status_code == HTTP_404_NOT_FOUND
@@ -0,0 +1,281 @@
+import pytest
+from baserow.contrib.database.rows.signals import rows_created
+from django.core.management import call_command
+from django.shortcuts import reverse
+
+from teople1.enrollment import is_enrolled
+from teople1.models import CourseProgress, EnrollmentKey
+
+
+@pytest.fixture
+def learning(teople):
+    courses = teople.create_table("Courses", primary="title")
+    lessons = teople.create_table("Lessons", primary="title")
+    users = teople.create_table("Users", primary="username")
+    progress = teople.create_table("Progress", primary="name", completed="boolean")
+    teople.create_link(lessons, courses, "course")
+    teople.create_link(progress, courses, "course")
+    teople.create_link(progress, users, "user")
+    teople.create_link(progress, lessons, "lesson")
+
+    course = teople.create_row(courses, title="Python")
+    first = teople.create_row(lessons, title="One", course=[course.id])
+    second = teople.create_row(lessons, title="Two", course=[course.id])
+    user = teople.create_row(users, username="ada")
+    return course, first, second, user
+
+
+def summary(api_client, **params):
+    response = api_client.get(reverse("api:teople1:course_progress"), params)
+    return response.json()["course_progress"]
+
+
+@pytest.mark.django_db
+def test_progress_writes_maintain_counters(api_client, learning):
+    course, first, second, user = learning
+
+    response = api_client.post(
+        reverse("api:teople1:progress"),
+        {
+            "course": [course.id],
+            "user": [user.id],
+            "lesson": [first.id],
+            "completed": True,
+        },
+        format="json",
+    )
+    progress_id = response.json()["progress"]["id"]
+    [record] = summary(api_client, user_id=user.id)
+    assert record["course_id"] == course.id
+    assert record["completed_count"] == 1
+    assert record["total_lessons"] == 2
+    assert record["percentage"] == 50
+    assert record["completed"] is False
+
+    api_client.post(
+        reverse("api:teople1:lessons"),
+        {"title": "Three", "course": [course.id]},
+        format="json",
+    )
+    assert summary(api_client, course_id=course.id)[0]["total_lessons"] == 3
+
+    api_client.delete(
+        reverse("api:teople1:progress_detail", kwargs={"row_id": progress_id})
+    )
+    assert summary(api_client) == []
+
+
+@pytest.mark.django_db
+def test_lesson_updates_only_refresh_when_the_course_changes(
+    api_client, learning, teople, mocker
+):
+    course, first, second, user = learning
+    other = teople.create_row(teople.database.table_set.get(name="Courses"), title="Go")
+    refresh_courses = mocker.patch("teople1.api.views.refresh_courses")
+    url = reverse("api:teople1:lesson_detail", kwargs={"row_id": first.id})
+
+    api_client.patch(url, {"title": "One again"}, format="json")
+    refresh_courses.assert_not_called()
+
+    api_client.patch(url, {"course": [other.id]}, format="json")
+    refresh_courses.assert_called_once_with({course.id, other.id})
+
+
+@pytest.mark.django_db
+def test_counters_follow_baserow_changes(api_client, learning, teople):
+    course, first, second, user = learning
+    other = teople.create_row(teople.database.table_set.get(name="Courses"), title="Go")
+    lessons = teople.database.table_set.get(name="Lessons")
+    progress = teople.database.table_set.get(name="Progress")
+
+    row = teople.baserow_create_row(
+        progress,
+        name="a",
+        course=[course.id],
+        user=[user.id],
+        lesson=[first.id],
+        completed=True,
+    )
+    [record] = summary(api_client, user_id=user.id)
+    assert (record["completed_count"], record["total_lessons"]) == (1, 2)
+
+    third = teople.baserow_create_row(lessons, title="Three", course=[course.id])
+    assert summary(api_client, user_id=user.id)[0]["total_lessons"] == 3
+
+    teople.baserow_update_row(lessons, third, course=[other.id])
+    assert summary(api_client, user_id=user.id)[0]["total_lessons"] == 2
+
+    teople.baserow_update_row(progress, row, course=[other.id], lesson=[third.id])
+    [record] = summary(api_client, user_id=user.id)
+    assert record["course_id"] == other.id
+    assert (record["completed_count"], record["total_lessons"]) == (1, 1)
+
+    teople.baserow_delete_row(progress, row)
+    assert summary(api_client) == []
+
+
+@pytest.mark.django_db
+def test_rebuild_command(api_client, learning, teople):
+    course, first, second, user = learning
+    progress = teople.database.table_set.get(name="Progress")
+    for lesson in (first, second):
+        teople.create_row(
+            progress,
+            name="p",
+            course=[course.id],
+            user=[user.id],
+            lesson=[lesson.id],
+            completed=True,
+        )
+    assert not CourseProgress.objects.exists()
+
+    call_command("rebuild_course_progress")
+
+    record = CourseProgress.objects.get(user_id=user.id, course_id=course.id)
+    assert record.completed_count == 2
+    assert record.completed is True
+
+
+@pytest.mark.django_db
+def test_progress_upsert_is_idempotent(api_client, learning, teople):
+    course, first, second, user = learning
+    url = reverse("api:teople1:progress_upsert")
+    payload = {"course": [course.id], "user": [user.id], "lesson": [first.id]}
+
+    response = api_client.put(url, {**payload, "completed": False}, format="json")
+    assert response.status_code == 201
+    progress_id = response.json()["progress"]["id"]
+
+    response = api_client.put(url, {**payload, "completed": True}, format="json")
+    body = response.json()
+    assert response.status_code == 200
+    assert body["created"] is False
+    assert body["updated_fields"] == ["completed"]
+    assert body["progress"]["id"] == progress_id
+
+    progress = teople.database.table_set.get(name="Progress")
+    teople.create_row(
+        progress, name="dupe", course=[course.id], user=[user.id], lesson=[first.id]
+    )
+    body = api_client.put(url, payload, format="json").json()
+    assert body["removed_duplicates"] == 1
+    assert progress.get_model().objects.count() == 1
+    assert summary(api_client)[0]["completed_count"] == 1
+
+    response = api_client.post(url, payload, format="json")
+    assert response.status_code == 405
+
+
+@pytest.mark.django_db
+def test_bulk_enrollment_job(
+    api_client, learning, teople, django_capture_on_commit_callbacks
+):
+    course, first, second, user = learning
+    enrollments = teople.create_table("Enrollments", primary="name")
+    users = teople.database.table_set.get(name="Users")
+    other = teople.create_row(users, username="grace")
+    url = reverse("api:teople1:enrollments_bulk")
+
+    response = api_client.post(
+        url, {"course": course.id, "users": [user.id, 999]}, format="json"
+    )
+    assert response.status_code == 400
+    assert response.json()["missing"] == [999]
+
+    with django_capture_on_commit_callbacks(execute=True):
+        response = api_client.post(
+            url, {"course": course.id, "users": [user.id, other.id]}, format="json"
+        )
+    assert response.status_code == 202
+    job_id = response.json()["job"]["id"]
+
+    job = api_client.get(
+        reverse("api:teople1:enrollment_job", kwargs={"job_id": job_id})
+    ).json()["job"]
+    assert job["state"] == "finished"
+    assert job["enrolled"] == 2
+    assert job["progress_created"] == 4
+    assert enrollments.get_model().objects.count() == 2
+    assert {r["user_id"] for r in summary(api_client)} == {user.id, other.id}
+
+    with django_capture_on_commit_callbacks(execute=True):
+        response = api_client.post(
+            url, {"course": [course.id], "users": [user.id]}, format="json"
+        )
+    job_id = response.json()["job"]["id"]
+    job = api_client.get(
+        reverse("api:teople1:enrollment_job", kwargs={"job_id": job_id})
+    ).json()["job"]
+    assert job["skipped"] == 1
+    assert job["skipped_users"] == [user.id]
+    assert job["progress_created"] == 0
+
+
+@pytest.mark.django_db
+def test_duplicate_enrollments_are_rejected_by_key(api_client, learning, teople):
+    course, first, second, user = learning
+    teople.create_table("Enrollments", primary="name")
+    payload = {"course": [course.id], "user": [user.id]}
+
+    response = api_client.post(
+        reverse("api:teople1:enrollments"), payload, format="json"
+    )
+    assert response.status_code == 201
+    enrollment_id = response.json()["enrollment"]["id"]
+    assert EnrollmentKey.objects.filter(user_id=user.id, course_id=course.id).exists()
+
+    response = api_client.post(
+        reverse("api:teople1:enrollments"), payload, format="json"
+    )
+    assert response.status_code == 400
+    assert response.json()["type"] == "duplicate_entry"
+
+    api_client.delete(
+        reverse("api:teople1:enrollment_detail", kwargs={"row_id": enrollment_id})
+    )
+    assert not EnrollmentKey.objects.exists()
+
+    response = api_client.post(
+        reverse("api:teople1:enrollments_batch"),
+        {"items": [payload, payload]},
+        format="json",
+    )
+    assert response.status_code == 400
+    assert response.json()["type"] == "duplicate_entry"
+    assert not EnrollmentKey.objects.exists()
+
+
+@pytest.mark.django_db
+def test_enrollment_keys_follow_baserow_changes(api_client, learning, teople):
+    course, first, second, user = learning
+    enrollments = teople.create_table("Enrollments", primary="name")
+    teople.create_link(
+        enrollments, teople.database.table_set.get(name="Courses"), "course"
+    )
+    teople.create_link(enrollments, teople.database.table_set.get(name="Users"), "user")
+    payload = {"course": [course.id], "user": [user.id]}
+
+    # Rows written without the keys are still found in the link table.
+    row = teople.create_row(enrollments, name="a", **payload)
+    assert is_enrolled(user.id, course.id)
+
+    rows_created.send(
+        None, rows=[row], before=None, user=None, table=enrollments, model=type(row)
+    )
+    assert EnrollmentKey.objects.get().enrollment_id == row.id
+
+    duplicate = teople.baserow_create_row(enrollments, name="b", **payload)
+    assert EnrollmentKey.objects.count() == 1
+
+    teople.baserow_delete_row(enrollments, row)
+    assert not EnrollmentKey.objects.exists()
+    response = api_client.post(
+        reverse("api:teople1:enrollments"), payload, format="json"
+    )
+    assert response.json()["type"] == "duplicate_entry"
+
+    duplicate.delete()
+    response = api_client.post(
+        reverse("api:teople1:enrollments"), payload, format="json"
+    )
+    assert response.status_code == 201
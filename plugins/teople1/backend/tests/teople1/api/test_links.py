@@ -0,0 +1,50 @@
+import pytest
+from django.db import connection
+from django.shortcuts import reverse
+from django.test.utils import CaptureQueriesContext
+
+from teople1.api.cache import LRUCache
+from teople1.api.links import display_values, get_display_values
+
+
+def test_lru_cache_evicts_least_recently_used():
+    cache = LRUCache(2)
+    cache.set_many({"a": 1, "b": 2})
+    assert cache.get_many(["a"]) == {"a": 1}
+    cache.set_many({"c": 3})
+    assert cache.get_many(["a", "b", "c"]) == {"a": 1, "c": 3}
+    cache.delete_many(["a"])
+    assert len(cache) == 1
+    assert cache.stats() == {
+        "size": 1,
+        "maxsize": 2,
+        "hits": 3,
+        "misses": 1,
+        "evictions": 1,
+    }
+
+
+@pytest.mark.django_db
+def test_display_values_are_cached_and_invalidated(
+    api_client, teople, django_capture_on_commit_callbacks
+):
+    display_values.clear()
+    courses = teople.create_table("Courses", primary="title")
+    python = teople.create_row(courses, title="Python")
+    django = teople.create_row(courses, title="Django")
+
+    assert get_display_values("Courses", [python.id, django.id]) == {
+        python.id: "Python",
+        django.id: "Django",
+    }
+    with CaptureQueriesContext(connection) as queries:
+        assert get_display_values("Courses", [python.id]) == {python.id: "Python"}
+    assert len(queries) == 0
+
+    with django_capture_on_commit_callbacks(execute=True):
+        api_client.patch(
+            reverse("api:teople1:course_detail", kwargs={"row_id": python.id}),
+            {"title": "Python 3"},
+            format="json",
+        )
+    assert get_display_values("Courses", [python.id]) == {python.id: "Python 3"}
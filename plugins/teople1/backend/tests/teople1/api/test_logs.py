@@ -0,0 +1,59 @@
+import logging
+from datetime import datetime
+from types import SimpleNamespace
+
+from teople1.api import logs
+from teople1.api.logs import LogSampler
+from teople1.api.serializers import RowSerializer
+
+
+class Row:
+    id = 1
+    order = 1
+    created_on = updated_on = datetime(2024, 1, 1)
+    field_1 = "Python"
+
+    @property
+    def field_2(self):
+        raise ValueError("broken column")
+
+
+def field_object(field_id, name):
+    return {
+        "field": SimpleNamespace(name=name),
+        "name": f"field_{field_id}",
+        "type": SimpleNamespace(type="text"),
+    }
+
+
+def test_sampler_suppresses_repeats_within_the_interval(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(logs.time, "monotonic", lambda: now[0])
+    sampler = LogSampler(interval=60)
+
+    assert sampler.sample("a") == 0
+    assert sampler.sample("a") is None
+    assert sampler.sample("a") is None
+    assert sampler.sample("b") == 0
+    now[0] += 61
+    assert sampler.sample("a") == 2
+
+
+def test_field_errors_are_logged_once_per_response(caplog):
+    logs.sampler.clear()
+    serializer = RowSerializer(
+        [field_object(1, "title"), field_object(2, "summary")], "Courses"
+    )
+
+    with caplog.at_level(logging.WARNING):
+        rows = serializer.serialize_many([Row() for _ in range(100)])
+
+    assert rows[0]["title"] == "Python"
+    assert all(row["summary"] is None for row in rows)
+    assert len(caplog.records) == 1
+    assert "summary of Courses in 100 rows" in caplog.records[0].getMessage()
+
+    caplog.clear()
+    with caplog.at_level(logging.WARNING):
+        serializer.serialize_columns([Row()])
+    assert caplog.records == []
@@ -0,0 +1,34 @@
+import pytest
+from baserow.contrib.database.fields.signals import field_created
+
+from teople1.api.model_cache import table_models
+from teople1.api.schema import get_table_schema, invalidate_schema, schemas
+
+
+@pytest.mark.django_db
+def test_models_are_reused_until_a_field_changes(teople, data_fixture):
+    courses = teople.create_table("Courses", primary="title")
+
+    model = get_table_schema("Courses").model
+    invalidate_schema("Courses")
+    assert get_table_schema("Courses").model is model
+    assert table_models.stats()["hits"] >= 1
+
+    field = data_fixture.create_text_field(table=courses, name="summary")
+    invalidate_schema("Courses")
+    changed = get_table_schema("Courses")
+    assert changed.model is not model
+    assert changed.column("summary") == f"field_{field.id}"
+
+
+@pytest.mark.django_db
+def test_field_signals_drop_the_cached_schema(teople, data_fixture):
+    courses = teople.create_table("Courses", primary="title")
+    schema = get_table_schema("Courses")
+
+    field = data_fixture.create_text_field(table=courses, name="summary")
+    field_created.send(None, field=field, related_fields=[], user=None)
+
+    assert schemas.get((teople.database.id, "Courses")) is None
+    assert get_table_schema("Courses") is not schema
+    assert get_table_schema("Courses").column("summary") == f"field_{field.id}"
@@ -0,0 +1,35 @@
+import json
+from datetime import date, datetime, timezone
+from decimal import Decimal
+
+import pytest
+
+from teople1.api import renderers
+from teople1.api.renderers import FastJSONRenderer
+
+
+DATA = {
+    "created_on": datetime(2024, 5, 1, 12, 30, 15, 250000, tzinfo=timezone.utc),
+    "due": date(2024, 5, 2),
+    "price": Decimal("9.50"),
+    "rows": [{"id": 1, "title": "Café"}],
+}
+
+EXPECTED = {
+    "created_on": "2024-05-01T12:30:15.250000+00:00",
+    "due": "2024-05-02",
+    "price": 9.5,
+    "rows": [{"id": 1, "title": "Café"}],
+}
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_renders_dates_and_decimals_natively(monkeypatch, use_orjson):
+    if use_orjson:
+        pytest.importorskip("orjson")
+    else:
+        monkeypatch.setattr(renderers, "orjson", None)
+
+    rendered = FastJSONRenderer().render(DATA)
+    assert json.loads(rendered) == EXPECTED
+    assert FastJSONRenderer().render(None) == b""
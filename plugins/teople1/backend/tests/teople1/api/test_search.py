@@ -0,0 +1,69 @@
+import pytest
+from django.shortcuts import reverse
+
+
+@pytest.fixture
+def catalog(teople):
+    teople.create_table("Courses", primary="title", description="long_text")
+    teople.create_table("Lessons", primary="title", content="long_text")
+
+
+def search(api_client, **params):
+    return api_client.get(reverse("api:teople1:search"), params)
+
+
+@pytest.mark.django_db
+def test_search_ranks_courses_and_lessons(api_client, catalog):
+    response = api_client.post(
+        reverse("api:teople1:courses"),
+        {"title": "Python basics", "description": "Learn variables and loops"},
+        format="json",
+    )
+    course_id = response.json()["course"]["id"]
+    api_client.post(
+        reverse("api:teople1:lessons"),
+        {"title": "Loops", "content": "A for loop repeats a block for every item"},
+        format="json",
+    )
+
+    body = search(api_client, q="loops").json()
+    assert body["count"] == 2
+    assert [hit["type"] for hit in body["results"]] == ["lesson", "course"]
+    assert "<mark>" in body["results"][1]["snippet"]
+
+    body = search(api_client, q="python", type="course").json()
+    assert [hit["id"] for hit in body["results"]] == [course_id]
+
+    api_client.patch(
+        reverse("api:teople1:course_detail", kwargs={"row_id": course_id}),
+        {"title": "Django basics"},
+        format="json",
+    )
+    assert search(api_client, q="python").json()["count"] == 0
+
+    api_client.delete(
+        reverse("api:teople1:course_detail", kwargs={"row_id": course_id})
+    )
+    assert search(api_client, q="variables").json()["count"] == 0
+
+
+@pytest.mark.django_db
+def test_search_validates_parameters(api_client, catalog):
+    assert search(api_client).status_code == 400
+    assert search(api_client, q="x", type="quiz").status_code == 400
+    assert search(api_client, q="x", page=0).status_code == 400
+
+
+@pytest.mark.django_db
+def test_search_follows_baserow_changes(api_client, catalog, teople):
+    courses = teople.database.table_set.get(name="Courses")
+
+    row = teople.baserow_create_row(courses, title="Python", description="Variables")
+    assert search(api_client, q="python").json()["count"] == 1
+
+    teople.baserow_update_row(courses, row, title="Django")
+    assert search(api_client, q="python").json()["count"] == 0
+    assert search(api_client, q="django").json()["count"] == 1
+
+    teople.baserow_delete_row(courses, row)
+    assert search(api_client, q="django").json()["count"] == 0
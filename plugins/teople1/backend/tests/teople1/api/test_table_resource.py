@@ -0,0 +1,242 @@
+import pytest
+from django.shortcuts import reverse
+from rest_framework.status import (
+    HTTP_200_OK,
+    HTTP_201_CREATED,
+    HTTP_400_BAD_REQUEST,
+    HTTP_404_NOT_FOUND,
+)
+
+
+@pytest.fixture
+def courses_and_lessons(teople):
+    courses = teople.create_table("Courses", primary="title", published="boolean")
+    lessons = teople.create_table("Lessons", primary="title")
+    teople.create_link(lessons, courses, "course")
+    python = teople.create_row(courses, title="Python", published=True)
+    django = teople.create_row(courses, title="Django")
+    for i in range(3):
+        teople.create_row(lessons, title=f"Python {i}", course=[python.id])
+    teople.create_row(lessons, title="Django 0", course=[django.id])
+    return python, django
+
+
+@pytest.mark.django_db
+def test_list_serializes_links_and_filters_by_relation(api_client, courses_and_lessons):
+    python, _ = courses_and_lessons
+
+    response = api_client.get(reverse("api:teople1:lessons"), {"course_id": python.id})
+    assert response.status_code == HTTP_200_OK
+    body = response.json()
+    assert body["status"] == "success"
+    assert body["count"] == 3
+    assert body["lessons"][0]["course"] == [python.id]
+
+    response = api_client.get(reverse("api:teople1:courses"))
+    titles = {c["title"]: c["published"] for c in response.json()["courses"]}
+    assert titles == {"Python": True, "Django": False}
+
+
+@pytest.mark.django_db
+def test_expand_embeds_link_display_values(api_client, courses_and_lessons):
+    python, django = courses_and_lessons
+
+    response = api_client.get(
+        reverse("api:teople1:lessons"), {"course_id": django.id, "expand": "course"}
+    )
+    assert response.json()["lessons"][0]["course"] == [
+        {"id": django.id, "value": "Django"}
+    ]
+
+    response = api_client.get(reverse("api:teople1:lessons"), {"expand": "title"})
+    assert response.status_code == HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.django_db
+def test_list_pagination(api_client, courses_and_lessons):
+    response = api_client.get(reverse("api:teople1:lessons"), {"page": 2, "size": 3})
+    body = response.json()
+    assert body["count"] == 4
+    assert body["page"] == 2
+    assert body["next"] is None
+    assert len(body["lessons"]) == 1
+
+    response = api_client.get(reverse("api:teople1:lessons"), {"page": "x"})
+    assert response.status_code == HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.django_db
+def test_create_update_and_delete_row(api_client, courses_and_lessons):
+    python, _ = courses_and_lessons
+
+    response = api_client.post(
+        reverse("api:teople1:lessons"),
+        {"title": "Python 3", "course": [python.id]},
+        format="json",
+    )
+    assert response.status_code == HTTP_201_CREATED
+    lesson = response.json()["lesson"]
+    assert lesson["course"] == [python.id]
+
+    url = reverse("api:teople1:lesson_detail", kwargs={"row_id": lesson["id"]})
+    response = api_client.put(url, {"title": "Renamed"}, format="json")
+    assert response.json()["lesson"]["title"] == "Renamed"
+
+    assert api_client.delete(url).status_code == HTTP_200_OK
+    response = api_client.get(url)
+    assert response.status_code == HTTP_404_NOT_FOUND
+    assert response.json() == {"status": "error", "message": "Lesson not found"}
+
+
+@pytest.mark.django_db
+def test_create_requires_fields(api_client, courses_and_lessons):
+    response = api_client.post(reverse("api:teople1:courses"), {}, format="json")
+    assert response.status_code == HTTP_400_BAD_REQUEST
+    assert response.json()["errors"] == {"title": "This field is required."}
+
+
+@pytest.mark.django_db
+def test_batch_create(api_client, courses_and_lessons):
+    python, django = courses_and_lessons
+
+    response = api_client.post(
+        reverse("api:teople1:lessons_batch"),
+        {
+            "items": [
+                {"title": "Batch 1", "course": [python.id]},
+                {"title": "Batch 2", "course": [python.id, django.id]},
+            ]
+        },
+        format="json",
+    )
+    assert response.status_code == HTTP_201_CREATED
+    body = response.json()
+    assert body["count"] == 2
+    assert [len(lesson["course"]) for lesson in body["lessons"]] == [1, 2]
+
+    response = api_client.get(reverse("api:teople1:lessons_batch"))
+    assert response.status_code == 405
+
+
+@pytest.mark.django_db
+def test_patch_only_saves_changed_fields(api_client, courses_and_lessons):
+    python, django = courses_and_lessons
+    url = reverse("api:teople1:course_detail", kwargs={"row_id": python.id})
+
+    response = api_client.patch(
+        url, {"title": "Python", "published": True}, format="json"
+    )
+    assert response.status_code == HTTP_200_OK
+    assert response.json()["updated_fields"] == []
+
+    response = api_client.patch(
+        url, {"title": "Python", "published": False}, format="json"
+    )
+    body = response.json()
+    assert body["updated_fields"] == ["published"]
+    assert body["course"]["published"] is False
+
+    lessons = api_client.get(reverse("api:teople1:lessons")).json()["lessons"]
+    lesson_url = reverse(
+        "api:teople1:lesson_detail", kwargs={"row_id": lessons[0]["id"]}
+    )
+    response = api_client.patch(lesson_url, {"course": [django.id]}, format="json")
+    assert response.json()["updated_fields"] == ["course"]
+    assert response.json()["lesson"]["course"] == [django.id]
+
+
+@pytest.mark.django_db
+def test_patch_compares_numbers_as_decimals(api_client, teople, data_fixture):
+    tasks = teople.create_table("Tasks", primary="task_name")
+    data_fixture.create_number_field(
+        table=tasks, name="estimate", number_decimal_places=2
+    )
+    task = teople.create_row(tasks, task_name="Write", estimate="0.10")
+    url = reverse("api:teople1:task_detail", kwargs={"row_id": task.id})
+
+    response = api_client.patch(url, {"estimate": 0.1}, format="json")
+    assert response.json()["updated_fields"] == []
+
+    response = api_client.patch(url, {"estimate": "1.5"}, format="json")
+    assert response.json()["updated_fields"] == ["estimate"]
+
+
+@pytest.mark.django_db
+def test_batch_delete_by_ids_and_filters(api_client, courses_and_lessons):
+    python, django = courses_and_lessons
+    url = reverse("api:teople1:lessons_batch_delete")
+
+    response = api_client.post(url, {}, format="json")
+    assert response.status_code == HTTP_400_BAD_REQUEST
+
+    response = api_client.post(
+        url, {"filters": {"course_id": python.id}}, format="json"
+    )
+    assert response.status_code == HTTP_200_OK
+    assert response.json()["deleted"] == 3
+
+    lessons = api_client.get(reverse("api:teople1:lessons")).json()["lessons"]
+    assert [lesson["title"] for lesson in lessons] == ["Django 0"]
+
+    response = api_client.post(
+        url, {"ids": [lessons[0]["id"]], "filters": {"title": "Other"}}, format="json"
+    )
+    assert response.json()["deleted"] == 0
+
+    response = api_client.post(url, {"ids": [lessons[0]["id"]]}, format="json")
+    assert response.json()["deleted"] == 1
+
+    response = api_client.get(
+        reverse("api:teople1:course_detail", kwargs={"row_id": django.id})
+    )
+    assert response.json()["course"]["title"] == "Django"
+
+
+@pytest.mark.django_db
+def test_delete_removes_links_without_reverse_field(
+    api_client, courses_and_lessons, teople, data_fixture
+):
+    python, django = courses_and_lessons
+    notes = teople.create_table("Notes")
+    courses = teople.database.table_set.get(name="Courses")
+    link = data_fixture.create_link_row_field(
+        table=notes, link_row_table=courses, name="course", has_related_field=False
+    )
+    note = teople.create_row(notes, name="Read first", course=[django.id])
+
+    response = api_client.delete(
+        reverse("api:teople1:course_detail", kwargs={"row_id": django.id})
+    )
+    assert response.status_code == HTTP_200_OK
+    assert not getattr(note, f"field_{link.id}").exists()
+
+
+@pytest.mark.django_db
+def test_list_columns_shape(api_client, courses_and_lessons):
+    response = api_client.get(
+        reverse("api:teople1:courses"), {"shape": "columns", "page": 1, "size": 1}
+    )
+    body = response.json()
+    assert body["count"] == 2
+    assert body["columns"][:4] == ["id", "order", "created_on", "updated_on"]
+    assert "courses" not in body
+    [row] = body["rows"]
+    assert dict(zip(body["columns"], row))["title"] == "Python"
+
+    response = api_client.get(reverse("api:teople1:courses"), {"shape": "table"})
+    assert response.status_code == HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.django_db
+def test_list_as_msgpack(api_client, courses_and_lessons):
+    msgpack = pytest.importorskip("msgpack")
+
+    response = api_client.get(
+        reverse("api:teople1:courses"),
+        {"shape": "columns"},
+        HTTP_ACCEPT="application/msgpack",
+    )
+    assert response["Content-Type"] == "application/msgpack"
+    body = msgpack.unpackb(response.content)
+    assert body["count"] == 2
+    assert len(body["rows"]) == 2
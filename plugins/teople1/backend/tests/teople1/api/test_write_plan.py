@@ -0,0 +1,60 @@
+import pytest
+from django.shortcuts import reverse
+from rest_framework.status import HTTP_201_CREATED, HTTP_400_BAD_REQUEST
+
+from teople1.api.coercion import PayloadError
+from teople1.api.schema import get_table_schema
+
+
+@pytest.fixture
+def tasks(teople, data_fixture):
+    table = teople.create_table(
+        "Tasks", primary="task_name", estimate="number", done="boolean"
+    )
+    status = data_fixture.create_single_select_field(table=table, name="status")
+    data_fixture.create_select_option(field=status, value="Open")
+    return table
+
+
+@pytest.mark.django_db
+def test_write_plan_collects_all_errors(tasks):
+    plan = get_table_schema("Tasks").write_plan
+
+    with pytest.raises(PayloadError) as exc:
+        plan.prepare(
+            {"estimate": "many", "status": "Closed", "unknown": 1},
+            required=("task_name",),
+        )
+    assert set(exc.value.errors) == {"task_name", "estimate", "status"}
+
+    schema = get_table_schema("Tasks")
+    values, m2m = plan.prepare(
+        {"task_name": "Write docs", "estimate": "2", "done": "yes", "status": "Open"}
+    )
+    option = schema.by_name["status"]["field"].select_options.get()
+    assert values == {
+        schema.column("task_name"): "Write docs",
+        schema.column("estimate"): 2.0,
+        schema.column("done"): True,
+        f"{schema.column('status')}_id": option.id,
+    }
+    assert m2m == {}
+
+
+@pytest.mark.django_db
+def test_batch_errors_are_reported_per_item(api_client, tasks):
+    response = api_client.post(
+        reverse("api:teople1:tasks_batch"),
+        {"items": [{"task_name": "ok"}, {"estimate": "x"}]},
+        format="json",
+    )
+    assert response.status_code == HTTP_400_BAD_REQUEST
+    assert set(response.json()["errors"]["1"]) == {"task_name", "estimate"}
+
+    response = api_client.post(
+        reverse("api:teople1:tasks"),
+        {"task_name": "ok", "status": {"value": "Open"}},
+        format="json",
+    )
+    assert response.status_code == HTTP_201_CREATED
+    assert response.json()["task"]["status"]["value"] == "Open"
@@ -0,0 +1,51 @@
+import gzip
+
+import pytest
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory
+
+from teople1 import compression
+from teople1.middleware import CompressionMiddleware
+
+
+BODY = b'{"title": "Python basics"}' * 200
+
+
+def respond(path, accept_encoding, response):
+    request = RequestFactory().get(path, HTTP_ACCEPT_ENCODING=accept_encoding)
+    return CompressionMiddleware(lambda request: response)(request)
+
+
+def test_compresses_large_teople_responses_with_gzip(monkeypatch):
+    monkeypatch.setattr(compression, "brotli", None)
+
+    response = respond("/api/teople1/courses/", "gzip, br", HttpResponse(BODY))
+    assert response["Content-Encoding"] == "gzip"
+    assert response["Vary"] == "Accept-Encoding"
+    assert gzip.decompress(response.content) == BODY
+
+    response = respond("/api/teople1/courses/", "gzip", HttpResponse(b"{}"))
+    assert not response.has_header("Content-Encoding")
+
+    response = respond("/api/database/rows/", "gzip", HttpResponse(BODY))
+    assert not response.has_header("Content-Encoding")
+
+
+def test_prefers_brotli():
+    brotli = pytest.importorskip("brotli")
+
+    response = respond("/api/teople1/courses/", "gzip, br", HttpResponse(BODY))
+    assert response["Content-Encoding"] == "br"
+    assert brotli.decompress(response.content) == BODY
+
+
+def test_compresses_streaming_responses(monkeypatch):
+    monkeypatch.setattr(compression, "brotli", None)
+
+    response = respond(
+        "/api/teople1/progress/",
+        "gzip",
+        StreamingHttpResponse(iter([BODY[:100], BODY[100:]])),
+    )
+    assert response["Content-Encoding"] == "gzip"
+    assert gzip.decompress(b"".join(response.streaming_content)) == BODY
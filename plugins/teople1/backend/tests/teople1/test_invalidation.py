@@ -0,0 +1,85 @@
+import pytest
+from django.core.cache import cache
+
+from teople1 import invalidation
+from teople1.api.links import display_values, get_display_values
+from teople1.api.schema import get_table_schema, schemas
+from teople1.signals import publish_rows_change
+
+
+def bump_from_other_worker(table_id):
+    for key in (invalidation.version_key(table_id), invalidation.EPOCH_KEY):
+        cache.add(key, 0, timeout=None)
+        cache.incr(key)
+
+
+def log_rows_from_other_worker(table_id, row_ids):
+    cache.add(invalidation.ROWS_KEY, 0, timeout=None)
+    number = cache.incr(invalidation.ROWS_KEY)
+    cache.set(invalidation.rows_key(number), (table_id, row_ids))
+
+
+@pytest.mark.django_db
+def test_sync_drops_what_other_workers_invalidated(teople):
+    courses = teople.create_table("Courses", primary="title")
+    python = teople.create_row(courses, title="Python")
+    go = teople.create_row(courses, title="Go")
+    key = (teople.database.id, "Courses")
+
+    schema = get_table_schema("Courses")
+    invalidation.sync()
+    get_display_values("Courses", [python.id, go.id])
+    assert schemas.get(key) is schema
+
+    epoch = cache.get(invalidation.EPOCH_KEY)
+    log_rows_from_other_worker(courses.id, [python.id])
+    invalidation.sync()
+    assert cache.get(invalidation.EPOCH_KEY) == epoch
+    assert schemas.get(key) is schema
+    assert display_values.get((courses.id, python.id)) is None
+    assert display_values.get((courses.id, go.id)) == "Go"
+
+    bump_from_other_worker(courses.id)
+    invalidation.sync()
+    assert schemas.get(key) is None
+    assert display_values.get((courses.id, go.id)) is None
+
+    get_table_schema("Courses")
+    invalidation.sync()
+    assert schemas.get(key) is not None
+
+
+@pytest.mark.django_db
+def test_publish_schema_bumps_the_shared_version(
+    teople, django_capture_on_commit_callbacks
+):
+    courses = teople.create_table("Courses", primary="title")
+    get_table_schema("Courses")
+    key = invalidation.version_key(courses.id)
+    before = cache.get(key, 0)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        invalidation.publish_schema([courses.id])
+
+    assert schemas.get((teople.database.id, "Courses")) is None
+    assert cache.get(key) == before + 1
+
+
+@pytest.mark.django_db
+def test_changes_outside_tenant_databases_are_ignored(
+    teople, data_fixture, django_capture_on_commit_callbacks
+):
+    courses = teople.create_table("Courses", primary="title")
+    python = teople.create_row(courses, title="Python")
+    other = data_fixture.create_database_table(name="Courses")
+    other_row = other.get_model().objects.create()
+    before = cache.get(invalidation.ROWS_KEY, 0)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        publish_rows_change(None, rows=[other_row], table=other)
+    assert cache.get(invalidation.ROWS_KEY, 0) == before
+
+    with django_capture_on_commit_callbacks(execute=True):
+        publish_rows_change(None, rows=[python], table=courses)
+    assert cache.get(invalidation.ROWS_KEY) == before + 1
+    assert cache.get(invalidation.rows_key(before + 1)) == (courses.id, [python.id])
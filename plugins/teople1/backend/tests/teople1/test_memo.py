@@ -0,0 +1,47 @@
+import pytest
+
+from teople1.api.schema import get_table_schema, invalidate_schema
+from teople1.memo import memoized, request_memo, stats
+
+
+def test_memoizes_per_request():
+    calls = []
+
+    def lookup(value):
+        calls.append(value)
+        return value * 2
+
+    assert memoized("a", lookup, 1) == 2
+    assert memoized("a", lookup, 1) == 2
+    assert calls == [1, 1]
+
+    before = stats()
+    with request_memo() as memo:
+        assert memoized("a", lookup, 2) == 4
+        assert memoized("a", lookup, 2) == 4
+        assert memoized("b", lookup, 3) == 6
+    assert calls == [1, 1, 2, 3]
+    assert (memo.lookups, memo.saved) == (3, 1)
+
+    after = stats()
+    assert after["requests"] == before["requests"] + 1
+    assert after["saved"] == before["saved"] + 1
+
+    with request_memo():
+        assert memoized("a", lookup, 5) == 10
+    assert calls == [1, 1, 2, 3, 5]
+
+
+@pytest.mark.django_db
+def test_schema_lookups_are_shared_within_a_request(teople, django_assert_num_queries):
+    teople.create_table("Courses", primary="title")
+    invalidate_schema()
+
+    with request_memo() as memo:
+        schema = get_table_schema("Courses")
+        with django_assert_num_queries(0):
+            assert get_table_schema("Courses") is schema
+        assert memo.saved == 1
+
+        invalidate_schema("Courses")
+        assert get_table_schema("Courses") is not schema
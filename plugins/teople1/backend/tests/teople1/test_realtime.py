@@ -0,0 +1,62 @@
+from unittest.mock import patch
+
+import pytest
+from django.shortcuts import reverse
+
+from teople1.realtime import CoursePageType, get_group_name, make_token, read_token
+from teople1.tenants import use_database
+
+
+def test_course_page_requires_a_valid_token():
+    page = CoursePageType()
+    with use_database(5):
+        token = make_token(7)
+
+    assert read_token(token) == (5, 7)
+    assert read_token("7") is None
+    assert read_token(None) is None
+    assert page.can_add(None, "ws", course_id=3, token=token)
+    assert not page.can_add(None, "ws", course_id=3, token="forged")
+    assert not page.can_add(None, "ws", course_id="3", token=token)
+    assert page.get_group_name(course_id=3, token=token) == get_group_name(5, 7, 3)
+
+
+@pytest.mark.django_db
+def test_progress_changes_are_broadcast_to_user_and_course(
+    api_client, teople, django_capture_on_commit_callbacks
+):
+    courses = teople.create_table("Courses", primary="title")
+    lessons = teople.create_table("Lessons", primary="title")
+    users = teople.create_table("Users", primary="username")
+    progress = teople.create_table("Progress", primary="name", completed="boolean")
+    teople.create_link(progress, courses, "course")
+    teople.create_link(progress, users, "user")
+    teople.create_link(progress, lessons, "lesson")
+    course = teople.create_row(courses, title="Python")
+    lesson = teople.create_row(lessons, title="One")
+    user = teople.create_row(users, username="ada")
+
+    with patch("teople1.realtime.broadcast_to_channel_group") as broadcast:
+        with django_capture_on_commit_callbacks(execute=True):
+            response = api_client.post(
+                reverse("api:teople1:progress"),
+                {"course": [course.id], "user": [user.id], "lesson": [lesson.id]},
+                format="json",
+            )
+        row_id = response.json()["progress"]["id"]
+
+        group, payload, _ = broadcast.delay.call_args.args
+        assert group == get_group_name(teople.database.id, user.id, course.id)
+        assert payload["type"] == "teople1_rows_changed"
+        assert payload["table"] == "Progress"
+        assert [row["id"] for row in payload["rows"]] == [row_id]
+        assert payload["deleted"] == []
+
+        with django_capture_on_commit_callbacks(execute=True):
+            api_client.delete(
+                reverse("api:teople1:progress_detail", kwargs={"row_id": row_id})
+            )
+        group, payload, _ = broadcast.delay.call_args.args
+        assert group == get_group_name(teople.database.id, user.id, course.id)
+        assert payload["rows"] == []
+        assert payload["deleted"] == [row_id]
@@ -0,0 +1,59 @@
+from django.http import HttpResponse
+from django.test import RequestFactory
+
+from teople1.middleware import ReplicaMiddleware
+from teople1.routers import ReplicaRouter, pin_primary
+
+
+def read_alias_during(request, status=200):
+    aliases = []
+
+    def view(request):
+        aliases.append(ReplicaRouter().db_for_read(None))
+        return HttpResponse(status=status)
+
+    response = ReplicaMiddleware(view)(request)
+    return aliases[0], response
+
+
+def test_routes_teople_reads_to_the_replica(settings):
+    settings.TEOPLE1_REPLICA_ALIAS = "replica"
+    factory = RequestFactory()
+
+    alias, _ = read_alias_during(factory.get("/api/teople1/courses/"))
+    assert alias == "replica"
+    assert ReplicaRouter().db_for_read(None) is None
+
+    alias, _ = read_alias_during(factory.get("/api/database/rows/"))
+    assert alias is None
+
+    assert ReplicaRouter().db_for_write(None) is None
+    assert ReplicaRouter().allow_migrate("replica", "teople1") is False
+    assert ReplicaRouter().allow_migrate("default", "teople1") is None
+
+
+def test_reads_stay_on_the_primary_after_a_write(settings):
+    settings.TEOPLE1_REPLICA_STICKY_SECONDS = 5
+    factory = RequestFactory()
+
+    alias, response = read_alias_during(factory.post("/api/teople1/courses/"))
+    assert alias is None
+    cookie = response.cookies[ReplicaMiddleware.cookie_name]
+    assert cookie["max-age"] == 5
+
+    request = factory.get("/api/teople1/courses/")
+    request.COOKIES[ReplicaMiddleware.cookie_name] = cookie.value
+    alias, _ = read_alias_during(request)
+    assert alias is None
+
+    _, response = read_alias_during(factory.post("/api/teople1/courses/"), 400)
+    assert ReplicaMiddleware.cookie_name not in response.cookies
+
+
+def test_pin_primary_moves_the_remaining_reads_to_the_primary():
+    def view(request):
+        pin_primary()
+        return HttpResponse(ReplicaRouter().db_for_read(None) or "default")
+
+    request = RequestFactory().get("/api/teople1/courses/")
+    assert ReplicaMiddleware(view)(request).content == b"default"
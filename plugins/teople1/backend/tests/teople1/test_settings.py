@@ -0,0 +1,60 @@
+from django.conf import settings as django_settings
+
+from teople1.config.settings.settings import setup
+
+
+class SettingsSnapshot(dict):
+    """
+    Like the object Baserow passes to `setup`: attributes are read from a
+    snapshot of the settings and assignments go to the settings module instead.
+    """
+
+    def __init__(self, **values):
+        super().__init__(values)
+        object.__setattr__(self, "assigned", {})
+
+    def __getattr__(self, name):
+        return self[name]
+
+    def __setattr__(self, name, value):
+        self.assigned[name] = value
+
+
+def test_middleware_is_added_in_order(monkeypatch):
+    monkeypatch.setenv("TEOPLE1_REPLICA_HOST", "db-replica")
+    snapshot = SettingsSnapshot(
+        DATABASES={"default": {"HOST": "db"}},
+        DATABASE_ROUTERS=[],
+        MIDDLEWARE=["baserow.Middleware"],
+    )
+
+    setup(snapshot)
+
+    assert snapshot.assigned["MIDDLEWARE"] == [
+        "teople1.middleware.CompressionMiddleware",
+        "baserow.Middleware",
+        "teople1.middleware.ReplicaMiddleware",
+        "teople1.middleware.TenantMiddleware",
+        "teople1.middleware.InvalidationMiddleware",
+        "teople1.middleware.MemoMiddleware",
+    ]
+
+
+def test_replica_router_is_added_without_baserow_routers(monkeypatch):
+    monkeypatch.setenv("TEOPLE1_REPLICA_HOST", "db-replica")
+    snapshot = SettingsSnapshot(DATABASES={"default": {"HOST": "db"}}, MIDDLEWARE=[])
+
+    setup(snapshot)
+
+    assert snapshot.assigned["DATABASE_ROUTERS"] == ["teople1.routers.ReplicaRouter"]
+    assert snapshot["DATABASES"]["replica"]["HOST"] == "db-replica"
+
+
+def test_baserow_settings_include_the_middleware():
+    middleware = django_settings.MIDDLEWARE
+    assert middleware[0] == "teople1.middleware.CompressionMiddleware"
+    assert middleware[-3:] == [
+        "teople1.middleware.TenantMiddleware",
+        "teople1.middleware.InvalidationMiddleware",
+        "teople1.middleware.MemoMiddleware",
+    ]
@@ -0,0 +1,62 @@
+import pytest
+from django.test import RequestFactory
+
+from teople1.api.schema import get_table_schema
+from teople1.tenants import TenantNotFound, resolve_tenant, use_database
+
+
+@pytest.fixture
+def school(teople, data_fixture):
+    """A second tenant with its own Courses table."""
+
+    database = data_fixture.create_database_application(name="school2")
+    courses = data_fixture.create_database_table(database=database, name="Courses")
+    data_fixture.create_text_field(table=courses, name="title", primary=True)
+    return database, courses
+
+
+def test_resolve_tenant(settings):
+    factory = RequestFactory()
+
+    settings.TEOPLE1_TENANT_RESOLVER = "host"
+    settings.TEOPLE1_TENANT_HOSTS = {"learn.example.com": 3}
+    request = factory.get("/", HTTP_HOST="learn.example.com")
+    assert resolve_tenant(request) == 3
+    with pytest.raises(TenantNotFound):
+        resolve_tenant(factory.get("/", HTTP_HOST="school2.example.com"))
+
+    settings.TEOPLE1_TENANT_RESOLVER = "path"
+    settings.TEOPLE1_TENANT_SLUGS = {"school2": "2"}
+    assert resolve_tenant(factory.get("/"), "school2") == 2
+    with pytest.raises(TenantNotFound):
+        resolve_tenant(factory.get("/"), "Teople")
+
+
+@pytest.mark.django_db
+def test_schemas_are_per_tenant(teople, school):
+    database, courses = school
+    teople_courses = teople.create_table("Courses", primary="title")
+
+    assert get_table_schema("Courses").table.id == teople_courses.id
+    with use_database(database.id):
+        assert get_table_schema("Courses").table.id == courses.id
+
+
+@pytest.mark.django_db
+def test_path_prefix_selects_the_tenant(api_client, settings, teople, school):
+    settings.TEOPLE1_TENANT_RESOLVER = "path"
+    database, courses = school
+    settings.TEOPLE1_TENANT_SLUGS = {"school2": database.id}
+    teople.create_row(teople.create_table("Courses", primary="title"), title="Python")
+    courses.get_model().objects.create(**{f"field_{courses.field_set.get().id}": "Go"})
+
+    response = api_client.get("/api/teople1/t/school2/courses/")
+    assert [course["title"] for course in response.json()["courses"]] == ["Go"]
+
+    response = api_client.get("/api/teople1/courses/")
+    assert [course["title"] for course in response.json()["courses"]] == ["Python"]
+
+    # Databases that aren't mapped can't be reached by naming them.
+    for slug in ("unknown", "school2-other", "Teople"):
+        response = api_client.get(f"/api/teople1/t/{slug}/courses/")
+        assert response.status_code == 404
@@ -0,0 +1,35 @@
+import asyncio
+
+import pytest
+from django.urls import resolve, reverse
+
+from teople1.api import schema as schema_module
+from teople1.api.urls import lazy_view
+from teople1.warmup import get_api_tables, warm_up
+
+
+def test_views_are_resolved_on_first_request():
+    match = resolve(reverse("api:teople1:courses"))
+    assert match.func.__name__ == "CoursesView"
+    assert match.func.csrf_exempt
+    assert match.func.cls.__name__ == "CoursesView"
+
+    batch = resolve(reverse("api:teople1:courses_batch"))
+    assert batch.func.initkwargs == {"action": "batch_create"}
+
+    overview = resolve(reverse("api:teople1:course_overview", kwargs={"row_id": 1}))
+    assert asyncio.iscoroutinefunction(overview.func)
+    assert not asyncio.iscoroutinefunction(lazy_view("CoursesView"))
+
+
+def test_api_tables():
+    assert {"Courses", "Lessons", "Enrollments", "Progress"} <= set(get_api_tables())
+
+
+@pytest.mark.django_db
+def test_warm_up_builds_the_existing_table_schemas(teople):
+    teople.create_table("Courses", primary="title")
+    schema_module.invalidate_schema()
+
+    assert warm_up() == ["Courses"]
+    assert schema_module.schemas.get((teople.database.id, "Courses"))
@@ -0,0 +1,7 @@
+#!/bin/bash
+# Allows the db-replica service of docker-compose.multi-service.dev.yml to stream
+# from this database. Only runs when the pgdata volume is initialised.
+set -e
+# md5 accepts both md5 and SCRAM stored passwords, the default postgres:12 image
+# stores md5 ones.
+echo "host replication all all md5" >> "$PGDATA/pg_hba.conf"